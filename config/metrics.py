@@ -0,0 +1,114 @@
+"""
+Prometheus metrics of the web application.
+
+Under gunicorn every worker is a separate process, so the metrics are kept
+in prometheus_client's multiprocess mode: with PROMETHEUS_MULTIPROC_DIR set,
+each process writes its values to files in that directory and a scrape of
+any worker aggregates the files of all of them. Without it, as in tests and
+``runserver``, the process serves its own registry.
+"""
+
+import os
+import threading
+
+from prometheus_client import REGISTRY
+from prometheus_client import CollectorRegistry
+from prometheus_client import Counter
+from prometheus_client import Gauge
+from prometheus_client import Histogram
+from prometheus_client import generate_latest
+from prometheus_client import multiprocess
+
+HTTP_METHODS = frozenset(
+    {"GET", "HEAD", "OPTIONS", "POST", "PUT", "PATCH", "DELETE"},
+)
+UNRESOLVED = "<unresolved>"
+
+REQUEST_LATENCY = Histogram(
+    "django_http_request_duration_seconds",
+    "Time spent handling a request, by URL name and method.",
+    ["view", "method"],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+RESPONSES = Counter(
+    "django_http_responses",
+    "Responses sent, by URL name, method and status code.",
+    ["view", "method", "status"],
+)
+DB_QUERIES = Histogram(
+    "django_db_queries_per_request",
+    "Database queries made while handling a request, by URL name.",
+    ["view"],
+    buckets=(0, 1, 2, 4, 6, 8, 10, 15, 20, 30, 50, 100),
+)
+DB_DURATION = Histogram(
+    "django_db_duration_seconds_per_request",
+    "Time spent in the database while handling a request, by URL name.",
+    ["view"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+)
+WORKERS = Gauge(
+    "gunicorn_workers",
+    "Running gunicorn worker processes.",
+    multiprocess_mode="livesum",
+)
+WORKERS_BUSY = Gauge(
+    "gunicorn_workers_busy",
+    "Gunicorn workers handling at least one request.",
+    multiprocess_mode="livesum",
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    "gunicorn_requests_in_progress",
+    "Requests being handled by gunicorn workers.",
+    multiprocess_mode="livesum",
+)
+
+
+def method_label(method: str) -> str:
+    """Return ``method``, or "other" for methods that would add label values."""
+    return method if method in HTTP_METHODS else "other"
+
+
+def observe_request(request, response, duration: float, recorder) -> None:
+    """Record a handled request and the queries ``recorder`` counted for it."""
+    match = request.resolver_match
+    view = match.view_name if match else UNRESOLVED
+    method = method_label(request.method)
+    REQUEST_LATENCY.labels(view, method).observe(duration)
+    RESPONSES.labels(view, method, str(response.status_code)).inc()
+    DB_QUERIES.labels(view).observe(recorder.count)
+    DB_DURATION.labels(view).observe(recorder.duration)
+
+
+class WorkerActivity:
+    """Track the requests in progress in this worker, for the busy gauges."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.active = 0
+
+    def started(self) -> None:
+        with self.lock:
+            self.active += 1
+            REQUESTS_IN_PROGRESS.inc()
+            WORKERS_BUSY.set(1)
+
+    def finished(self) -> None:
+        with self.lock:
+            self.active -= 1
+            REQUESTS_IN_PROGRESS.dec()
+            if not self.active:
+                WORKERS_BUSY.set(0)
+
+
+worker_activity = WorkerActivity()
+
+
+def collect() -> bytes:
+    """Return the metrics of all worker processes in the text format."""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry)
@@ -0,0 +1,184 @@
+"""Project-wide middleware."""
+
+import contextlib
+import logging
+import re
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.db import connections
+
+from config import metrics
+from config import routers
+
+logger = logging.getLogger(__name__)
+
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+# Parts of a statement that vary between otherwise identical queries.
+PLACEHOLDER_LIST = re.compile(r"\((?:%s, )+%s\)")
+LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+\b")
+WHITESPACE = re.compile(r"\s+")
+
+
+def fingerprint(sql: str) -> str:
+    """Return ``sql`` with literals and placeholder lists collapsed."""
+    sql = PLACEHOLDER_LIST.sub("(...)", sql)
+    sql = LITERAL.sub("?", sql)
+    return WHITESPACE.sub(" ", sql).strip()
+
+
+class QueryRecorder:
+    """
+    Execute wrapper that counts, times and fingerprints queries.
+
+    Pass ``fingerprints=False`` to only count and time them, which skips
+    the regular expressions run on every statement.
+    """
+
+    def __init__(self, *, fingerprints: bool = True):
+        self.count = 0
+        self.duration = 0.0
+        self.fingerprints = Counter()
+        self.track_fingerprints = fingerprints
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+            if self.track_fingerprints:
+                self.fingerprints[fingerprint(sql)] += 1
+
+    @property
+    def duplicates(self) -> int:
+        """Return how many queries repeated the shape of an earlier one."""
+        return sum(count - 1 for count in self.fingerprints.values())
+
+    def repeated(self) -> list[tuple[str, int]]:
+        """Return the repeated query shapes, most repeated first."""
+        return [item for item in self.fingerprints.most_common() if item[1] > 1]
+
+
+@contextlib.contextmanager
+def record_queries(recorder: QueryRecorder):
+    """Pass the queries of every database connection through ``recorder``."""
+    with contextlib.ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(recorder))
+        yield recorder
+
+
+class MetricsMiddleware:
+    """
+    Record the latency, status and database queries of each request.
+
+    Installed first, so the time spent in the other middleware counts too.
+    Requests are labelled with their URL name, or "<unresolved>" when no URL
+    pattern matched, which keeps the number of label values bounded.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        start = time.perf_counter()
+        with record_queries(QueryRecorder(fingerprints=False)) as recorder:
+            response = self.get_response(request)
+        metrics.observe_request(
+            request,
+            response,
+            time.perf_counter() - start,
+            recorder,
+        )
+        return response
+
+
+class QueryBudgetMiddleware:
+    """
+    Report the database queries each request made.
+
+    Adds an ``X-DB-Queries`` header and logs a line with the query count,
+    the number of duplicates and the time spent in the database, at warning
+    level when a query shape repeats, which is how N+1 lookups show up.
+    Queries run while a streaming response is consumed are not counted.
+    Meant for development and tests.
+    """
+
+    header = "X-DB-Queries"
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with record_queries(QueryRecorder()) as recorder:
+            response = self.get_response(request)
+
+        response[self.header] = (
+            f"count={recorder.count}; duplicates={recorder.duplicates}; "
+            f"time={recorder.duration * 1000:.1f}ms"
+        )
+        repeated = recorder.repeated()
+        worst = ""
+        if repeated:
+            sql, count = repeated[0]
+            worst = f"; most repeated ({count}x): {sql}"
+        logger.log(
+            logging.WARNING if repeated else logging.INFO,
+            "%s %s: %d queries, %d duplicates, %.1fms in the database%s",
+            request.method,
+            request.path,
+            recorder.count,
+            recorder.duplicates,
+            recorder.duration * 1000,
+            worst,
+        )
+        return response
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Serve reads of replica-safe views from the read replica.
+
+    A view opts in with ``replica_reads = True``. A successful write request
+    sets a cookie that keeps the client's reads on the primary for
+    ``settings.REPLICA_PIN_SECONDS``, so users see their own changes even
+    while the replica has not replayed them yet.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = routers.replica_reads.set(False)
+        try:
+            # The flag stays set while the template response is rendered.
+            response = self.get_response(request)
+        finally:
+            routers.replica_reads.reset(token)
+        if (
+            settings.REPLICA_DATABASE
+            and request.method not in SAFE_METHODS
+            and response.status_code < 400  # noqa: PLR2004
+        ):
+            response.set_cookie(
+                routers.PIN_COOKIE,
+                "1",
+                max_age=settings.REPLICA_PIN_SECONDS,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_class = getattr(view_func, "view_class", None)
+        if (
+            settings.REPLICA_DATABASE
+            and request.method in SAFE_METHODS
+            and getattr(view_class, "replica_reads", False)
+            and routers.PIN_COOKIE not in request.COOKIES
+        ):
+            routers.replica_reads.set(True)
@@ -0,0 +1,50 @@
+"""Statistics of the psycopg connection pools of this process."""
+
+from django.db import connections
+
+
+def pool_stats(pool) -> dict[str, float]:
+    """
+    Summarize ``pool.get_stats()`` for monitoring.
+
+    Counters are cumulative since the pool was created. ``in_use`` counts the
+    connections that are not idle in the pool, including those being opened
+    or returned. psycopg_pool only times requests that had to queue, so the
+    average checkout wait spreads that time over all requests.
+    """
+    stats = pool.get_stats()
+    requests = stats.get("requests_num", 0)
+    queued = stats.get("requests_queued", 0)
+    wait_ms = stats.get("requests_wait_ms", 0)
+    return {
+        "min_size": stats["pool_min"],
+        "max_size": stats["pool_max"],
+        "size": stats["pool_size"],
+        "available": stats["pool_available"],
+        "in_use": stats["pool_size"] - stats["pool_available"],
+        "waiting": stats["requests_waiting"],
+        "requests": requests,
+        "requests_queued": queued,
+        "requests_errors": stats.get("requests_errors", 0),
+        "checkout_wait_ms_avg": wait_ms / requests if requests else 0.0,
+        "queued_wait_ms_avg": wait_ms / queued if queued else 0.0,
+        "usage_ms": stats.get("usage_ms", 0),
+        "returns_bad": stats.get("returns_bad", 0),
+        "connections_errors": stats.get("connections_errors", 0),
+        "connections_lost": stats.get("connections_lost", 0),
+    }
+
+
+def database_pools() -> dict:
+    """Return the connection pools of the configured databases, by alias."""
+    return {
+        alias: connections[alias].pool
+        for alias in connections
+        if getattr(connections[alias], "pool", None) is not None
+    }
+
+
+def close_pools() -> None:
+    """Close the connection pools, e.g. when a gunicorn worker exits."""
+    for alias in database_pools():
+        connections[alias].close_pool()
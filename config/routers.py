@@ -0,0 +1,108 @@
+"""Database routing of read-only views to an optional read replica."""
+
+import contextlib
+import contextvars
+import time
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from django.db import DatabaseError
+from django.db import connections
+
+# Whether reads of the current request may be served by the replica. Set by
+# ReplicaRoutingMiddleware for views that declare ``replica_reads = True``.
+replica_reads = contextvars.ContextVar("replica_reads", default=False)
+
+# Cookie telling the middleware that the client wrote something recently and
+# must read its own writes from the primary.
+PIN_COOKIE = "primary_pin"
+
+LAG_QUERY = """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+    END
+"""
+
+# Per process: alias -> (monotonic time of the check, measured lag or None).
+_lag_checks: dict[str, tuple[float, float | None]] = {}
+
+
+@contextlib.contextmanager
+def primary_reads():
+    """
+    Read from the primary within the block.
+
+    For reads whose result is written back or cached, which must not carry
+    the replica's lag along.
+    """
+    token = replica_reads.set(False)
+    try:
+        yield
+    finally:
+        replica_reads.reset(token)
+
+
+def measure_lag(alias: str) -> float | None:
+    """
+    Return how many seconds the replica's replay is behind the primary.
+
+    An idle replica that has replayed everything it received counts as not
+    behind however old its last transaction is. None means the lag is unknown:
+    the replica is unreachable or has not replayed anything yet.
+    """
+    try:
+        with connections[alias].cursor() as cursor:
+            cursor.execute(LAG_QUERY)
+            (lag,) = cursor.fetchone()
+    except DatabaseError:
+        connections[alias].close()
+        return None
+    return None if lag is None else float(lag)
+
+
+def replica_lag(alias: str) -> float | None:
+    """Return the replica lag, measuring it at most once per check interval."""
+    now = time.monotonic()
+    checked_at, lag = _lag_checks.get(alias, (None, None))
+    if checked_at is None or now - checked_at >= settings.REPLICA_LAG_CHECK_INTERVAL:
+        lag = measure_lag(alias)
+        _lag_checks[alias] = (now, lag)
+    return lag
+
+
+class ReplicaRouter:
+    """
+    Send reads of replica-safe requests to ``settings.REPLICA_DATABASE``.
+
+    Only models of ``app_labels`` are read from the replica; sessions and
+    users always come from the primary. Reads fall back to the primary while
+    the replica lags more than ``settings.REPLICA_MAX_LAG`` seconds or cannot
+    be reached, and all writes go to the primary.
+    """
+
+    app_labels = {"projects"}
+
+    def db_for_read(self, model, **hints):
+        alias = settings.REPLICA_DATABASE
+        if (
+            alias and replica_reads.get() and model._meta.app_label in self.app_labels  # noqa: SLF001
+        ):
+            lag = replica_lag(alias)
+            if lag is not None and lag <= settings.REPLICA_MAX_LAG:
+                return alias
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        # Objects read from the replica are saved to the primary.
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replica holds the same rows as the primary.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db == settings.REPLICA_DATABASE:
+            return False
+        return None
@@ -51,6 +51,21 @@ DATABASES = {
     ),
 }
 DATABASES["default"]["ATOMIC_REQUESTS"] = True
+# Optional streaming replica that serves reads of list, detail and dashboard
+# views (see config.routers).
+if env("DATABASE_REPLICA_URL", default=""):
+    DATABASES["replica"] = env.db("DATABASE_REPLICA_URL")
+    DATABASES["replica"]["TEST"] = {"MIRROR": "default"}
+# https://docs.djangoproject.com/en/dev/topics/db/multi-db/#database-routers
+DATABASE_ROUTERS = ["config.routers.ReplicaRouter"]
+# Alias reads are routed to, or None to read everything from the primary.
+REPLICA_DATABASE = "replica" if "replica" in DATABASES else None
+# Seconds a client reads from the primary after a successful write.
+REPLICA_PIN_SECONDS = env.int("DJANGO_REPLICA_PIN_SECONDS", default=10)
+# Replay lag in seconds beyond which reads fall back to the primary.
+REPLICA_MAX_LAG = env.float("DJANGO_REPLICA_MAX_LAG", default=5.0)
+# Seconds between replica lag measurements in each process.
+REPLICA_LAG_CHECK_INTERVAL = env.float("DJANGO_REPLICA_LAG_CHECK_INTERVAL", default=1.0)
 # https://docs.djangoproject.com/en/stable/ref/settings/#std:setting-DEFAULT_AUTO_FIELD
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
@@ -72,6 +87,7 @@ DJANGO_APPS = [
     "django.contrib.staticfiles",
     "django.contrib.humanize",
     "django.contrib.admin",
+    "django.contrib.postgres",
     "django.forms",
 ]
 THIRD_PARTY_APPS = [
@@ -135,6 +151,7 @@ AUTH_PASSWORD_VALIDATORS = [
 # ------------------------------------------------------------------------------
 # https://docs.djangoproject.com/en/dev/ref/settings/#middleware
 MIDDLEWARE = [
+    "config.middleware.MetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -145,6 +162,7 @@ MIDDLEWARE = [
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "allauth.account.middleware.AccountMiddleware",
+    "config.middleware.ReplicaRoutingMiddleware",
 ]
 
 # STATIC
@@ -300,3 +318,9 @@ STATICFILES_FINDERS += ["compressor.finders.CompressorFinder"]
 
 # Your stuff...
 # ------------------------------------------------------------------------------
+# Paginated listings switch from COUNT(*) to PostgreSQL's row estimate once
+# the estimate reaches this many rows.
+PROJECTS_ESTIMATED_COUNT_THRESHOLD = env.int(
+    "DJANGO_ESTIMATED_COUNT_THRESHOLD",
+    default=10_000,
+)
@@ -45,6 +45,11 @@ INSTALLED_APPS = ["whitenoise.runserver_nostatic", *INSTALLED_APPS]
 INSTALLED_APPS += ["debug_toolbar"]
 # https://django-debug-toolbar.readthedocs.io/en/latest/installation.html#middleware
 MIDDLEWARE += ["debug_toolbar.middleware.DebugToolbarMiddleware"]
+
+# Query budget
+# ------------------------------------------------------------------------------
+# Outermost, so that it also counts the queries of the other middleware.
+MIDDLEWARE = ["config.middleware.QueryBudgetMiddleware", *MIDDLEWARE]
 # https://django-debug-toolbar.readthedocs.io/en/latest/configuration.html#debug-toolbar-config
 DEBUG_TOOLBAR_CONFIG = {
     "DISABLE_PANELS": [
@@ -14,7 +14,35 @@ ALLOWED_HOSTS = env.list("DJANGO_ALLOWED_HOSTS", default=["dedapp.ru"])
 
 # DATABASES
 # ------------------------------------------------------------------------------
-DATABASES["default"]["CONN_MAX_AGE"] = env.int("CONN_MAX_AGE", default=60)
+# https://docs.djangoproject.com/en/dev/ref/databases/#connection-pool
+# Every gunicorn worker process has a pool per database. A worker serves one
+# request per thread, so by default it holds at most one connection per thread;
+# gunicorn.conf.py refuses to start more workers than DJANGO_DB_CONNECTION_BUDGET
+# allows.
+if env.bool("DJANGO_DB_POOL", default=True):
+    DB_POOL_OPTIONS = {
+        "min_size": env.int("DJANGO_DB_POOL_MIN_SIZE", default=1),
+        "max_size": env.int(
+            "DJANGO_DB_POOL_MAX_SIZE",
+            default=env.int("GUNICORN_THREADS", default=1),
+        ),
+        # Seconds a request waits for a free connection before failing.
+        "timeout": env.float("DJANGO_DB_POOL_TIMEOUT", default=10.0),
+        "max_idle": env.float("DJANGO_DB_POOL_MAX_IDLE", default=600.0),
+        "max_lifetime": env.float("DJANGO_DB_POOL_MAX_LIFETIME", default=3600.0),
+    }
+    for database in DATABASES.values():
+        # Pooled connections are returned after each request, not kept.
+        database["CONN_MAX_AGE"] = 0
+        # With a pool, Django hands this to psycopg_pool as
+        # check=ConnectionPool.check_connection: each connection is tested
+        # when it is taken from the pool and a dead one (after a failover or
+        # a server-side idle kill) is replaced. Setting "check" in the pool
+        # options as well is a TypeError.
+        database["CONN_HEALTH_CHECKS"] = True
+        database.setdefault("OPTIONS", {})["pool"] = dict(DB_POOL_OPTIONS)
+else:
+    DATABASES["default"]["CONN_MAX_AGE"] = env.int("CONN_MAX_AGE", default=60)
 
 # CACHES
 # ------------------------------------------------------------------------------
@@ -37,6 +65,9 @@ CACHES = {
 SECURE_PROXY_SSL_HEADER = ("HTTP_X_FORWARDED_PROTO", "https")
 # https://docs.djangoproject.com/en/dev/ref/settings/#secure-ssl-redirect
 SECURE_SSL_REDIRECT = env.bool("DJANGO_SECURE_SSL_REDIRECT", default=True)
+# Monitoring endpoints are served over plain HTTP on the private network.
+# https://docs.djangoproject.com/en/dev/ref/settings/#secure-redirect-exempt
+SECURE_REDIRECT_EXEMPT = [r"^metrics$", r"^health/db-pool$"]
 # https://docs.djangoproject.com/en/dev/ref/settings/#session-cookie-secure
 SESSION_COOKIE_SECURE = True
 # https://docs.djangoproject.com/en/dev/ref/settings/#session-cookie-name
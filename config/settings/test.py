@@ -3,6 +3,8 @@ With these settings, tests run faster.
 """
 
 from .base import *  # noqa: F403
+from .base import DATABASES
+from .base import MIDDLEWARE
 from .base import TEMPLATES
 from .base import env
 
@@ -34,5 +36,21 @@ TEMPLATES[0]["OPTIONS"]["debug"] = True  # type: ignore[index]
 # ------------------------------------------------------------------------------
 # https://docs.djangoproject.com/en/dev/ref/settings/#media-url
 MEDIA_URL = "http://media.testserver/"
+# DATABASES
+# ------------------------------------------------------------------------------
+# A mirror of the default database stands in for the read replica. Routing to
+# it is off unless a test enables it with override_settings(REPLICA_DATABASE=...).
+DATABASES["replica"] = {
+    **DATABASES["default"],
+    "ATOMIC_REQUESTS": False,
+    "TEST": {"MIRROR": "default"},
+}
+REPLICA_DATABASE = None
+
+# MIDDLEWARE
+# ------------------------------------------------------------------------------
+# Reports the queries of every request; tests/test_query_budgets.py reads it.
+MIDDLEWARE = ["config.middleware.QueryBudgetMiddleware", *MIDDLEWARE]
+
 # Your stuff...
 # ------------------------------------------------------------------------------
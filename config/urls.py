@@ -6,10 +6,14 @@ from django.urls import path
 from django.views import defaults as default_views
 from django.views.generic import TemplateView
 
+from config.views import db_pool_view
 from config.views import health_view
+from config.views import metrics_view
 
 urlpatterns = [
     path("health", health_view, name="health"),
+    path("health/db-pool", db_pool_view, name="health_db_pool"),
+    path("metrics", metrics_view, name="metrics"),
     path(
         "",
         include(
@@ -1,17 +1,50 @@
+import os
 from pathlib import Path
 
 import markdown
 from django.conf import settings
+from django.db import transaction
+from django.http import HttpResponse
 from django.http import JsonResponse
 from django.views.generic import TemplateView
+from prometheus_client import CONTENT_TYPE_LATEST
+
+from config import metrics
+from config.pools import database_pools
+from config.pools import pool_stats
 
 README_PATH = Path(settings.BASE_DIR) / "README.md"
 
 
+@transaction.non_atomic_requests
 def health_view(_request):
     return JsonResponse({"status": "ok"})
 
 
+@transaction.non_atomic_requests
+def db_pool_view(_request):
+    """Report the connection pools of the worker process serving the request."""
+    return JsonResponse(
+        {
+            "pid": os.getpid(),
+            "pools": {
+                alias: pool_stats(pool) for alias, pool in database_pools().items()
+            },
+        },
+    )
+
+
+@transaction.non_atomic_requests
+def metrics_view(_request):
+    """
+    Expose the Prometheus metrics of all gunicorn workers.
+
+    The public sites do not route this path; Prometheus reaches it through
+    the internal port of the reverse proxy.
+    """
+    return HttpResponse(metrics.collect(), content_type=CONTENT_TYPE_LATEST)
+
+
 def render_readme_as_html() -> str:
     try:
         readme_markdown = README_PATH.read_text(encoding="utf-8")
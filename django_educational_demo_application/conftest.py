@@ -1,4 +1,5 @@
 import pytest
+from django.core.cache import cache
 
 from django_educational_demo_application.users.models import User
 from django_educational_demo_application.users.tests.factories import UserFactory
@@ -9,6 +10,11 @@ def _media_storage(settings, tmpdir) -> None:
     settings.MEDIA_ROOT = tmpdir.strpath
 
 
+@pytest.fixture(autouse=True)
+def _clear_cache() -> None:
+    cache.clear()
+
+
 @pytest.fixture
 def user(db) -> User:
     return UserFactory()
@@ -1,6 +1,7 @@
 """Admin configuration for educational project management."""
 
 from django.contrib import admin
+from django.contrib import messages
 
 from .models import Course
 from .models import Enrollment
@@ -8,23 +9,43 @@ from .models import Project
 from .models import ProjectStatusLog
 from .models import Student
 from .models import Task
+from .pagination import EstimatedCountPaginator
+
+
+class CourseStatusFilter(admin.SimpleListFilter):
+    """Filter courses by date-based status in SQL."""
+
+    title = "status"
+    parameter_name = "status"
+
+    def lookups(self, request, model_admin):
+        return Course.STATUS_CHOICES
+
+    def queryset(self, request, queryset):
+        if self.value() in dict(Course.STATUS_CHOICES):
+            return queryset.filter_status(self.value())
+        return queryset
 
 
 @admin.register(Course)
 class CourseAdmin(admin.ModelAdmin):
     """Admin for Course model."""
 
-    list_display = ["code", "name", "start_date", "end_date", "is_active"]
-    list_filter = ["is_active", "start_date"]
+    list_display = ["code", "name", "start_date", "end_date", "status", "is_active"]
+    list_filter = ["is_active", CourseStatusFilter, "start_date"]
     search_fields = ["code", "name", "description"]
     ordering = ["-start_date"]
     readonly_fields = ["duration_days", "status"]
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).with_status()
+
     def duration_days(self, obj):
         return obj.duration_days
 
+    @admin.display(ordering="current_status")
     def status(self, obj):
-        return obj.status
+        return obj.get_status_display()
 
 
 @admin.register(Student)
@@ -52,12 +73,30 @@ class EnrollmentAdmin(admin.ModelAdmin):
     """Admin for Enrollment model."""
 
     list_display = ["student", "course", "enrolled_at", "is_active"]
+    list_select_related = ["student__user", "course"]
     list_filter = ["is_active", "course"]
     search_fields = ["student__user__username", "course__code"]
     ordering = ["-enrolled_at"]
     raw_id_fields = ["student", "course"]
 
 
+class OverdueFilter(admin.SimpleListFilter):
+    """Filter projects by the overdue predicate, served by the deadline index."""
+
+    title = "overdue"
+    parameter_name = "overdue"
+
+    def lookups(self, request, model_admin):
+        return [("yes", "Yes"), ("no", "No")]
+
+    def queryset(self, request, queryset):
+        if self.value() == "yes":
+            return queryset.overdue()
+        if self.value() == "no":
+            return queryset.exclude(Project.overdue_condition())
+        return queryset
+
+
 @admin.register(Project)
 class ProjectAdmin(admin.ModelAdmin):
     """Admin for Project model."""
@@ -73,24 +112,34 @@ class ProjectAdmin(admin.ModelAdmin):
         "created_at",
         "is_overdue_display",
     ]
-    list_filter = ["status", "priority", "course", "deadline"]
+    list_select_related = ["student__user", "course"]
+    list_filter = ["status", "priority", OverdueFilter, "course", "deadline"]
     search_fields = ["title", "description", "student__user__username", "course__code"]
     ordering = ["-created_at"]
     readonly_fields = [
         "created_at",
         "updated_at",
         "completed_at",
+        "task_count",
+        "completed_task_count",
         "progress_percentage",
     ]
     raw_id_fields = ["student", "course"]
     date_hierarchy = "created_at"
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    actions = ["complete_projects", "archive_projects"]
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).with_overdue()
 
     @admin.display(
         description="Overdue",
         boolean=True,
+        ordering="overdue",
     )
     def is_overdue_display(self, obj):
-        return obj.is_overdue
+        return obj.overdue
 
     @admin.display(
         description="Progress",
@@ -98,17 +147,39 @@ class ProjectAdmin(admin.ModelAdmin):
     def progress_percentage(self, obj):
         return obj.progress_percentage
 
+    @admin.action(description="Complete selected projects")
+    def complete_projects(self, request, queryset):
+        self.transition_projects(request, queryset, "completed")
+
+    @admin.action(description="Archive selected projects")
+    def archive_projects(self, request, queryset):
+        self.transition_projects(request, queryset, "archived")
+
+    def transition_projects(self, request, queryset, new_status):
+        """Bulk transition the selection, reporting projects that were skipped."""
+        selected = queryset.count()
+        moved = queryset.bulk_transition(new_status, user=request.user)
+        self.message_user(
+            request,
+            f"{len(moved)} project(s) moved to {new_status}, "
+            f"{selected - len(moved)} skipped as not allowed.",
+            messages.SUCCESS if moved else messages.WARNING,
+        )
+
 
 @admin.register(Task)
 class TaskAdmin(admin.ModelAdmin):
     """Admin for Task model."""
 
     list_display = ["title", "project", "is_completed", "order", "created_at"]
+    list_select_related = ["project__student__user"]
     list_filter = ["is_completed", "project__course"]
     search_fields = ["title", "description", "project__title"]
     ordering = ["project", "order", "created_at"]
     readonly_fields = ["created_at", "completed_at"]
     raw_id_fields = ["project"]
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
 
 @admin.register(ProjectStatusLog)
@@ -116,8 +187,11 @@ class ProjectStatusLogAdmin(admin.ModelAdmin):
     """Admin for ProjectStatusLog model."""
 
     list_display = ["project", "old_status", "new_status", "changed_at", "changed_by"]
+    list_select_related = ["project__student__user", "changed_by"]
     list_filter = ["old_status", "new_status", "changed_at"]
     search_fields = ["project__title", "changed_by__username"]
     ordering = ["-changed_at"]
     readonly_fields = ["changed_at"]
     raw_id_fields = ["project", "changed_by"]
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
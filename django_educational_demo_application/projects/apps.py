@@ -9,3 +9,7 @@ class ProjectsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "django_educational_demo_application.projects"
     verbose_name = "Educational Projects"
+
+    def ready(self):
+        """Import signals when Django starts."""
+        from . import signals  # noqa: F401
@@ -0,0 +1,82 @@
+"""Versioned cache entries for the dashboard and course statistics."""
+
+import contextlib
+import time
+from collections.abc import Iterable
+
+from django.core.cache import cache
+from django.db import transaction
+
+DASHBOARD_VERSION_KEY = "projects:dashboard:version"
+# Projects whose task progress the cached dashboard shows.
+DASHBOARD_PROJECTS_KEY = "projects:dashboard:projects"
+COURSE_VERSION_KEY = "projects:course:{}:version"
+CACHE_TIMEOUT = 60 * 60
+
+
+def get_version(key: str) -> int:
+    """
+    Return the current generation stored under ``key``.
+
+    Generations start from the current time in milliseconds rather than 1, so
+    a version key that was evicted never comes back with a number whose
+    entries are still cached.
+    """
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns() // 1_000_000, timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def _bump(keys: list[str]) -> None:
+    for key in keys:
+        # A missing key means nothing was cached under it yet.
+        with contextlib.suppress(ValueError):
+            cache.incr(key)
+
+
+def bump_versions(*, course_ids: Iterable[int | None] = ()) -> None:
+    """
+    Invalidate the dashboard and the given courses once the transaction commits.
+
+    Bumping after commit means a reader can only cache data under the old
+    generation while the old data is still what it sees.
+    """
+    keys = [DASHBOARD_VERSION_KEY]
+    keys += [COURSE_VERSION_KEY.format(pk) for pk in set(course_ids) if pk]
+    transaction.on_commit(lambda: _bump(keys))
+
+
+def bump_task_progress(project_ids: Iterable[int]) -> None:
+    """
+    Invalidate the dashboard once the transaction commits, if it shows progress.
+
+    Task writes only change the dashboard through the progress bars of its
+    recent projects, so the dashboard is kept unless one of ``project_ids`` is
+    among them, or it is unknown which projects it shows.
+    """
+    project_ids = set(project_ids)
+
+    def bump() -> None:
+        shown = cache.get(DASHBOARD_PROJECTS_KEY)
+        if shown is None or shown & project_ids:
+            _bump([DASHBOARD_VERSION_KEY])
+
+    transaction.on_commit(bump)
+
+
+def remember_dashboard_projects(project_ids: Iterable[int]) -> None:
+    """Record the projects whose progress a newly cached dashboard shows."""
+    cache.set(DASHBOARD_PROJECTS_KEY, set(project_ids), timeout=None)
+
+
+def dashboard_key(today) -> str:
+    """Return the cache key for the dashboard context on ``today``."""
+    return f"projects:dashboard:{today}:{get_version(DASHBOARD_VERSION_KEY)}"
+
+
+def course_stats_key(course_id: int) -> str:
+    """Return the cache key for a course's statistics block."""
+    version = get_version(COURSE_VERSION_KEY.format(course_id))
+    return f"projects:course:{course_id}:stats:{version}"
@@ -0,0 +1,155 @@
+"""Streaming CSV and NDJSON exports of project data."""
+
+import csv
+import itertools
+from collections.abc import Iterable
+from collections.abc import Sequence
+from operator import itemgetter
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import FilteredRelation
+from django.db.models import Q
+from django.http import StreamingHttpResponse
+
+from .models import Enrollment
+from .models import Project
+
+# Rows fetched per round trip from the server-side cursor.
+EXPORT_CHUNK_SIZE = 2000
+
+
+class Echo:
+    """File-like object whose ``write`` returns the value instead of buffering it."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def stream_csv(
+    filename: str,
+    header: Sequence[str],
+    rows: Iterable[Sequence],
+) -> StreamingHttpResponse:
+    """Return a CSV attachment written row by row as ``rows`` is consumed."""
+    writer = csv.writer(Echo())
+
+    def lines():
+        yield writer.writerow(header)
+        for row in rows:
+            yield writer.writerow(row)
+
+    return _attachment(lines(), "text/csv; charset=utf-8", filename)
+
+
+def stream_ndjson(
+    filename: str,
+    fields: Sequence[str],
+    rows: Iterable[Sequence],
+) -> StreamingHttpResponse:
+    """Return newline-delimited JSON objects keyed by ``fields``."""
+    encoder = DjangoJSONEncoder(ensure_ascii=False)
+
+    def lines():
+        # NDJSON has no header line: send the response headers before the
+        # query runs, as stream_csv does with its header, so a slow first
+        # row does not hit the proxy's read timeout.
+        yield ""
+        for row in rows:
+            yield encoder.encode(dict(zip(fields, row, strict=True))) + "\n"
+
+    return _attachment(lines(), "application/x-ndjson; charset=utf-8", filename)
+
+
+def _attachment(content, content_type: str, filename: str) -> StreamingHttpResponse:
+    response = StreamingHttpResponse(content, content_type=content_type)
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    # Pass chunks through nginx-style proxies instead of buffering them.
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+def deadline_state(status, deadline, completed_at, today) -> str:
+    """Describe how a project stands against its deadline."""
+    if deadline is None:
+        return ""
+    if status == "completed" and completed_at is not None:
+        return "on time" if completed_at.date() <= deadline else "late"
+    if status == "archived":
+        return ""
+    return "overdue" if deadline < today else "open"
+
+
+def gradebook(course, today) -> tuple[list[str], Iterable[list]]:
+    """
+    Return the header and rows of a course gradebook.
+
+    There is one row per enrolled student and four columns (status, score,
+    progress, deadline state) per distinct project title in the course.
+    Rows come from a single streamed query over the enrollments left-joined
+    to the course's projects and are pivoted while they are read.
+    """
+    titles = list(
+        Project.objects.filter(course=course)
+        .order_by("title")
+        .values_list("title", flat=True)
+        .distinct(),
+    )
+    header = ["student", "student_id", "group"]
+    for title in titles:
+        header += [
+            f"{title}: status",
+            f"{title}: score",
+            f"{title}: progress %",
+            f"{title}: deadline",
+        ]
+    columns = {title: 3 + 4 * index for index, title in enumerate(titles)}
+
+    records = (
+        Enrollment.objects.filter(course=course)
+        .alias(
+            course_projects=FilteredRelation(
+                "student__projects",
+                condition=Q(student__projects__course=course),
+            ),
+        )
+        .order_by(
+            "student__user__username",
+            "student_id",
+            "course_projects__created_at",
+        )
+        .values_list(
+            "student_id",
+            "student__user__username",
+            "student__student_id",
+            "student__group",
+            "course_projects__title",
+            "course_projects__status",
+            "course_projects__score",
+            "course_projects__task_count",
+            "course_projects__completed_task_count",
+            "course_projects__deadline",
+            "course_projects__completed_at",
+        )
+        .iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    )
+
+    def rows():
+        for _student, group in itertools.groupby(records, key=itemgetter(0)):
+            student_records = list(group)
+            row = [*student_records[0][1:4], *([""] * (len(header) - 3))]
+            for record in student_records:
+                column = columns.get(record[4])
+                # Skip students without projects, projects created after the
+                # header was built and repeated titles (the oldest wins).
+                if column is None or row[column]:
+                    continue
+                status, score, tasks, completed, deadline, completed_at = record[5:]
+                row[column : column + 4] = [
+                    status,
+                    "" if score is None else score,
+                    int(completed / tasks * 100) if tasks else 0,
+                    deadline_state(status, deadline, completed_at, today),
+                ]
+            yield row
+
+    return header, rows()
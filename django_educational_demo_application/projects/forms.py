@@ -1,6 +1,7 @@
 """Forms for educational project management."""
 
 from django import forms
+from django.contrib.postgres.forms import SimpleArrayField
 
 from .models import Course
 from .models import Enrollment
@@ -73,6 +74,11 @@ class EnrollmentForm(forms.ModelForm):
             "is_active": forms.CheckboxInput(attrs={"class": "form-check-input"}),
         }
 
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        # Student labels show the username.
+        self.fields["student"].queryset = Student.objects.select_related("user")
+
 
 class ProjectForm(forms.ModelForm):
     """Form for creating and editing projects."""
@@ -108,6 +114,11 @@ class ProjectForm(forms.ModelForm):
             ),
         }
 
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        # Student labels show the username.
+        self.fields["student"].queryset = Student.objects.select_related("user")
+
     def clean(self) -> dict:
         """Validate project data."""
         cleaned_data = super().clean()
@@ -126,6 +137,30 @@ class ProjectForm(forms.ModelForm):
         return cleaned_data
 
 
+class TaskMoveForm(forms.Form):
+    """Form for moving a task right after another one (first when empty)."""
+
+    after = forms.IntegerField(required=False, min_value=1)
+
+
+class TaskReorderForm(forms.Form):
+    """Form for applying a complete new order of a project's tasks."""
+
+    MAX_TASKS = 10_000
+
+    task_ids = SimpleArrayField(
+        forms.IntegerField(min_value=1),
+        max_length=MAX_TASKS,
+    )
+
+    def clean_task_ids(self) -> list[int]:
+        task_ids = self.cleaned_data["task_ids"]
+        if len(set(task_ids)) != len(task_ids):
+            msg = "Each task can appear only once."
+            raise forms.ValidationError(msg)
+        return task_ids
+
+
 class ProjectStatusTransitionForm(forms.Form):
     """Form for transitioning project status."""
 
@@ -150,6 +185,19 @@ class ProjectStatusTransitionForm(forms.Form):
             self.fields["new_status"].choices = allowed
 
 
+class ProjectBulkTransitionForm(forms.Form):
+    """Form for moving many projects to a new status at once."""
+
+    MAX_PROJECTS = 10_000
+
+    project_ids = SimpleArrayField(
+        forms.IntegerField(min_value=1),
+        max_length=MAX_PROJECTS,
+    )
+    new_status = forms.ChoiceField(choices=Project.STATUS_CHOICES)
+    comment = forms.CharField(required=False, widget=forms.Textarea)
+
+
 class TaskForm(forms.ModelForm):
     """Form for creating and editing tasks."""
 
@@ -177,3 +225,24 @@ class TaskBulkForm(forms.Form):
         ),
         help_text="Enter one task title per line",
     )
+
+    MAX_TITLES = 200
+
+    def clean_titles(self) -> list[str]:
+        """Split the input into non-empty task titles."""
+        titles = [
+            title.strip()
+            for title in self.cleaned_data["titles"].splitlines()
+            if title.strip()
+        ]
+        if not titles:
+            msg = "Enter at least one task title."
+            raise forms.ValidationError(msg)
+        if len(titles) > self.MAX_TITLES:
+            msg = f"Enter at most {self.MAX_TITLES} task titles at once."
+            raise forms.ValidationError(msg)
+        max_length = Task._meta.get_field("title").max_length  # noqa: SLF001
+        if any(len(title) > max_length for title in titles):
+            msg = f"Task titles can be at most {max_length} characters long."
+            raise forms.ValidationError(msg)
+        return titles
@@ -0,0 +1,148 @@
+"""Measure student search latency against a synthetic roster."""
+
+import random
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db import transaction
+from django.db.models import Q
+
+from django_educational_demo_application.projects.models import Student
+
+GROUPS = [
+    f"{prefix}-{number}"
+    for prefix in ("CS", "SE", "IT", "DS")
+    for number in range(101, 121)
+]
+UNUSABLE_PASSWORD = make_password(None)
+SYLLABLES = ["al", "be", "ka", "ro", "mi", "na", "to", "vi", "se", "le", "da", "ny"]
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed synthetic students inside a rolled back transaction and report "
+        "p50/p95 latency of the student list search."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--students",
+            type=int,
+            default=100_000,
+            help="Number of synthetic students to seed (default: 100000).",
+        )
+        parser.add_argument(
+            "--queries",
+            type=int,
+            default=200,
+            help="Number of search queries to time per variant (default: 200).",
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=42,
+            help="Random seed for the generated data and search terms.",
+        )
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])  # noqa: S311
+
+        with transaction.atomic():
+            students = self.seed(options["students"], rng)
+            terms = self.build_terms(students, options["queries"], rng)
+
+            self.report(
+                "indexed search",
+                terms,
+                Student.objects.search,
+            )
+            self.report(
+                "legacy icontains",
+                terms,
+                lambda term: Student.objects.filter(
+                    Q(user__username__icontains=term)
+                    | Q(student_id__icontains=term)
+                    | Q(group__icontains=term),
+                ),
+            )
+            transaction.set_rollback(True)
+
+    def seed(self, count: int, rng: random.Random) -> list[Student]:
+        """Insert ``count`` users with student profiles."""
+        User = get_user_model()  # noqa: N806
+        users = User.objects.bulk_create(
+            [
+                User(
+                    username="".join(rng.choices(SYLLABLES, k=rng.randint(2, 4)))
+                    + f"_bench{index}",
+                    password=UNUSABLE_PASSWORD,
+                )
+                for index in range(count)
+            ],
+            batch_size=5000,
+        )
+        students = []
+        for user in users:
+            student_id = f"STU{user.pk:05d}"
+            group = rng.choice(GROUPS)
+            students.append(
+                Student(
+                    user=user,
+                    student_id=student_id,
+                    group=group,
+                    search_key=Student.build_search_key(
+                        user.username,
+                        student_id,
+                        group,
+                    ),
+                ),
+            )
+        Student.objects.bulk_create(students, batch_size=5000)
+        with connection.cursor() as cursor:
+            # Give the planner statistics for the freshly inserted rows.
+            cursor.execute("ANALYZE")
+        self.stdout.write(f"Seeded {count} students.")
+        return students
+
+    def build_terms(
+        self,
+        students: list[Student],
+        count: int,
+        rng: random.Random,
+    ) -> list[str]:
+        """Return a mix of username fragments, groups and student ids."""
+        terms = []
+        for _ in range(count):
+            student = rng.choice(students)
+            kind = rng.randrange(3)
+            if kind == 0:
+                username = student.user.username
+                start = rng.randrange(len(username) - 3)
+                terms.append(username[start : start + 4])
+            elif kind == 1:
+                terms.append(student.group.lower())
+            else:
+                terms.append(student.student_id)
+        return terms
+
+    def report(self, label: str, terms: list[str], search) -> None:
+        """Time the first list page and its count for every term."""
+        timings = []
+        for term in terms:
+            started = time.perf_counter()
+            queryset = search(term).select_related("user")
+            queryset.count()
+            list(queryset[:20])
+            timings.append((time.perf_counter() - started) * 1000)
+
+        percentiles = statistics.quantiles(timings, n=100)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{label}: p50={percentiles[49]:.2f}ms "
+                f"p95={percentiles[94]:.2f}ms max={max(timings):.2f}ms",
+            ),
+        )
@@ -0,0 +1,41 @@
+"""Recompute the per-course statistics rollup."""
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from django_educational_demo_application.projects.models import CourseStats
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute CourseStats rows from the projects table, "
+        "repairing any drift in the incrementally maintained counters."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--course",
+            action="append",
+            type=int,
+            dest="course_ids",
+            help="Only rebuild the given course id (may be repeated).",
+        )
+        parser.add_argument(
+            "--stale",
+            action="store_true",
+            help=(
+                "Only rebuild rows that are missing or were computed on an "
+                "earlier day, whose overdue counts are out of date."
+            ),
+        )
+
+    def handle(self, *args, **options):
+        if options["stale"]:
+            rebuilt = CourseStats.refresh_stale(course_ids=options["course_ids"])
+        else:
+            with transaction.atomic():
+                rebuilt = CourseStats.rebuild(course_ids=options["course_ids"])
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt statistics for {rebuilt} course(s)."),
+        )
@@ -0,0 +1,30 @@
+"""Recompute the per-student statistics rollup."""
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from django_educational_demo_application.projects.models import StudentStats
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute StudentStats rows from the projects table, "
+        "repairing any drift in the incrementally maintained counters."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--student",
+            action="append",
+            type=int,
+            dest="student_ids",
+            help="Only rebuild the given student id (may be repeated).",
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            rebuilt = StudentStats.rebuild(student_ids=options["student_ids"])
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt statistics for {rebuilt} student(s)."),
+        )
@@ -0,0 +1,31 @@
+"""Recompute denormalized task counters on projects."""
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from django_educational_demo_application.projects.models import Project
+
+
+class Command(BaseCommand):
+    help = "Recompute Project.task_count and Project.completed_task_count from tasks."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--project",
+            action="append",
+            type=int,
+            dest="project_ids",
+            help="Only rebuild the given project id (may be repeated).",
+        )
+
+    def handle(self, *args, **options):
+        projects = Project.objects.all()
+        if options["project_ids"]:
+            projects = projects.filter(pk__in=options["project_ids"])
+
+        with transaction.atomic():
+            updated = projects.refresh_task_counters()
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt task counters for {updated} project(s)."),
+        )
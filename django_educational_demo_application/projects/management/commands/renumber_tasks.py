@@ -0,0 +1,51 @@
+"""Respace task orders of projects that ran out of gaps."""
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from django_educational_demo_application.projects.models import Project
+from django_educational_demo_application.projects.models import Task
+
+
+class Command(BaseCommand):
+    help = (
+        "Respace the task orders of projects whose neighbouring tasks are "
+        "closer than --min-gap, so that moving a task writes a single row "
+        "again. Meant to run periodically; a move into a full gap also "
+        "renumbers its project on the spot."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--min-gap",
+            type=int,
+            default=2,
+            help="Renumber projects with a gap below this (default: 2).",
+        )
+        parser.add_argument(
+            "--project",
+            action="append",
+            type=int,
+            dest="project_ids",
+            help="Renumber the given project id regardless of gaps (may be repeated).",
+        )
+
+    def handle(self, *args, **options):
+        project_ids = options["project_ids"] or sorted(
+            Task.objects.crowded_project_ids(options["min_gap"]),
+        )
+
+        renumbered = 0
+        for project_id in project_ids:
+            with transaction.atomic():
+                # Hold off moves and adds on this project while it is respaced.
+                locked = Project.objects.select_for_update().filter(pk=project_id)
+                if not locked.values_list("pk", flat=True):
+                    continue
+                renumbered += Task.objects.filter(project_id=project_id).renumber()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Renumbered {renumbered} task(s) in {len(project_ids)} project(s).",
+            ),
+        )
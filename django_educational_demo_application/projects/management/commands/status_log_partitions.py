@@ -0,0 +1,77 @@
+"""Maintain the monthly partitions of the project status log."""
+
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+from django.db import DEFAULT_DB_ALIAS
+from django.db import connections
+
+from django_educational_demo_application.projects import partitions
+
+
+class Command(BaseCommand):
+    help = (
+        "Create upcoming monthly partitions of the project status log and, "
+        "with --retain-months, detach older ones or archive them to gzipped "
+        "CSV files. The app host runs it daily from cron; it is safe to run "
+        "repeatedly."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--months-ahead",
+            type=int,
+            default=3,
+            help="Months to create partitions for past the current one (default: 3).",
+        )
+        parser.add_argument(
+            "--retain-months",
+            type=int,
+            help="Keep this many whole months before the current one attached.",
+        )
+        parser.add_argument(
+            "--archive-dir",
+            type=Path,
+            help=(
+                "Write expired partitions to <dir>/<partition>.csv.gz and drop "
+                "them. Without it expired partitions are only detached."
+            ),
+        )
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        if options["months_ahead"] < 0:
+            msg = "--months-ahead must not be negative."
+            raise CommandError(msg)
+        if options["retain_months"] is not None and options["retain_months"] < 0:
+            msg = "--retain-months must not be negative."
+            raise CommandError(msg)
+        archive_dir = options["archive_dir"]
+        if archive_dir is not None and not archive_dir.is_dir():
+            msg = f"{archive_dir} is not a directory."
+            raise CommandError(msg)
+
+        connection = connections[options["database"]]
+        for name in partitions.ensure_partitions(
+            connection,
+            months_ahead=options["months_ahead"],
+        ):
+            self.stdout.write(f"Created {name}.")
+
+        if options["retain_months"] is not None:
+            self.expire(connection, options["retain_months"], archive_dir)
+        self.stdout.write(self.style.SUCCESS("Status log partitions are up to date."))
+
+    def expire(self, connection, retain_months: int, archive_dir: Path | None) -> None:
+        """Detach or archive partitions older than ``retain_months``."""
+        for name in partitions.expired_partitions(
+            connection,
+            retain_months=retain_months,
+        ):
+            if archive_dir is None:
+                partitions.detach_partition(connection, name)
+                self.stdout.write(f"Detached {name}.")
+            else:
+                path = partitions.archive_partition(connection, name, archive_dir)
+                self.stdout.write(f"Archived {name} to {path}.")
@@ -0,0 +1,33 @@
+"""Prometheus metrics of projects, exposed by config.metrics."""
+
+from django.db import transaction
+from prometheus_client import Counter
+
+TRANSITIONS = Counter(
+    "lms_project_transitions",
+    "Committed project status transitions, by old and new status.",
+    ["old_status", "new_status"],
+)
+CACHE_LOOKUPS = Counter(
+    "lms_cache_lookups",
+    "Lookups of cached dashboard and course statistics, by hit or miss.",
+    ["cache", "result"],
+)
+
+
+def record_cache_lookup(name: str, value) -> None:
+    """Count a lookup of the ``name`` cache that returned ``value``."""
+    CACHE_LOOKUPS.labels(name, "miss" if value is None else "hit").inc()
+
+
+def record_transitions(old_statuses, new_status: str, *, using=None) -> None:
+    """Count a transition from each of ``old_statuses`` once they commit."""
+    counts = {}
+    for old_status in old_statuses:
+        counts[old_status] = counts.get(old_status, 0) + 1
+
+    def record() -> None:
+        for old_status, count in counts.items():
+            TRANSITIONS.labels(old_status, new_status).inc(count)
+
+    transaction.on_commit(record, using=using)
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.11 on 2026-10-17 00:08
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_task_counters(apps, schema_editor) -> None:
+    """Populate the new task counters from existing tasks."""
+    Project = apps.get_model("projects", "Project")
+    Task = apps.get_model("projects", "Task")
+
+    tasks = Task.objects.filter(project=OuterRef("pk")).order_by().values("project")
+    Project.objects.update(
+        task_count=Coalesce(
+            Subquery(tasks.annotate(count=Count("pk")).values("count")),
+            0,
+        ),
+        completed_task_count=Coalesce(
+            Subquery(
+                tasks.filter(is_completed=True)
+                .annotate(count=Count("pk"))
+                .values("count"),
+            ),
+            0,
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0002_add_student_profiles_for_existing_users'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='completed_task_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='task_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_task_counters, migrations.RunPython.noop),
+    ]
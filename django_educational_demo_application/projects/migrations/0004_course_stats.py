@@ -0,0 +1,82 @@
+# Generated by Django 5.2.11 on 2026-10-17 00:10
+
+import datetime
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+STATUSES = ("draft", "in_progress", "review", "completed", "archived")
+OPEN_STATUSES = ("draft", "in_progress", "review")
+
+
+def backfill_course_stats(apps, schema_editor) -> None:
+    """Create a statistics row for every existing course."""
+    Course = apps.get_model("projects", "Course")
+    CourseStats = apps.get_model("projects", "CourseStats")
+
+    today = timezone.now().date()
+    status_counts = {
+        f"{status}_count": Count("projects", filter=Q(projects__status=status))
+        for status in STATUSES
+    }
+    courses = Course.objects.annotate(
+        project_count=Count("projects"),
+        **status_counts,
+        graded_count=Count("projects__score"),
+        score_sum=Coalesce(Sum("projects__score"), 0),
+        overdue_count=Count(
+            "projects",
+            filter=Q(
+                projects__deadline__lt=today,
+                projects__status__in=OPEN_STATUSES,
+            ),
+        ),
+    )
+    CourseStats.objects.bulk_create(
+        (
+            CourseStats(
+                course=course,
+                project_count=course.project_count,
+                **{field: getattr(course, field) for field in status_counts},
+                graded_count=course.graded_count,
+                score_sum=course.score_sum,
+                overdue_count=course.overdue_count,
+                overdue_computed_on=today,
+            )
+            for course in courses.iterator()
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0003_project_task_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CourseStats',
+            fields=[
+                ('course', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='projects.course')),
+                ('project_count', models.PositiveIntegerField(default=0)),
+                ('draft_count', models.PositiveIntegerField(default=0)),
+                ('in_progress_count', models.PositiveIntegerField(default=0)),
+                ('review_count', models.PositiveIntegerField(default=0)),
+                ('completed_count', models.PositiveIntegerField(default=0)),
+                ('archived_count', models.PositiveIntegerField(default=0)),
+                ('graded_count', models.PositiveIntegerField(default=0)),
+                ('score_sum', models.PositiveBigIntegerField(default=0)),
+                ('overdue_count', models.PositiveIntegerField(default=0)),
+                ('overdue_computed_on', models.DateField(default=datetime.date(1, 1, 1))),
+            ],
+            options={
+                'verbose_name': 'Course Statistics',
+                'verbose_name_plural': 'Course Statistics',
+            },
+        ),
+        migrations.RunPython(backfill_course_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 5.2.11 on 2026-10-17 00:12
+
+import itertools
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Avg, Count, Q, Sum
+from django.db.models.functions import Coalesce
+
+
+def backfill_student_stats(apps, schema_editor) -> None:
+    """Create a statistics row for every existing student."""
+    Student = apps.get_model("projects", "Student")
+    StudentStats = apps.get_model("projects", "StudentStats")
+
+    students = Student.objects.annotate(
+        project_count=Count("projects"),
+        active_count=Count("projects", filter=Q(projects__status="in_progress")),
+        completed_count=Count("projects", filter=Q(projects__status="completed")),
+        graded_count=Count("projects__score"),
+        score_sum=Coalesce(Sum("projects__score"), 0),
+        average_score=Avg("projects__score"),
+    )
+    # One INSERT per batch, without holding every row in memory.
+    for batch in itertools.batched(students.iterator(chunk_size=1000), 1000):
+        StudentStats.objects.bulk_create(
+            StudentStats(
+                student=student,
+                project_count=student.project_count,
+                active_count=student.active_count,
+                completed_count=student.completed_count,
+                graded_count=student.graded_count,
+                score_sum=student.score_sum,
+                average_score=student.average_score,
+            )
+            for student in batch
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0004_course_stats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StudentStats',
+            fields=[
+                ('student', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='projects.student')),
+                ('project_count', models.PositiveIntegerField(default=0)),
+                ('active_count', models.PositiveIntegerField(default=0)),
+                ('completed_count', models.PositiveIntegerField(default=0)),
+                ('graded_count', models.PositiveIntegerField(default=0)),
+                ('score_sum', models.PositiveBigIntegerField(default=0)),
+                ('average_score', models.FloatField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Student Statistics',
+                'verbose_name_plural': 'Student Statistics',
+                'indexes': [models.Index(models.OrderBy(models.F('average_score'), descending=True), condition=models.Q(('graded_count__gt', 0)), name='projects_studentstats_top_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_student_stats, migrations.RunPython.noop),
+    ]
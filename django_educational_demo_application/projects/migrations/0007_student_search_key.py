@@ -0,0 +1,38 @@
+# Generated by Django 5.2.11 on 2026-10-17 00:15
+
+import django.contrib.postgres.indexes
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_search_key(apps, schema_editor) -> None:
+    """Populate the search key of existing students."""
+    Student = apps.get_model("projects", "Student")
+
+    students = []
+    for student in Student.objects.select_related("user").iterator(chunk_size=2000):
+        parts = (student.user.username, student.student_id, student.group)
+        student.search_key = " ".join(part for part in parts if part).lower()
+        students.append(student)
+    Student.objects.bulk_update(students, ["search_key"], batch_size=2000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0006_project_search'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='student',
+            name='search_key',
+            field=models.CharField(blank=True, editable=False, max_length=512),
+        ),
+        migrations.RunPython(backfill_search_key, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='student',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_key'], name='projects_student_search_idx', opclasses=['gin_trgm_ops']),
+        ),
+    ]
@@ -0,0 +1,117 @@
+# Generated by Django 5.2.11 on 2026-10-17 00:33
+
+import datetime
+
+from django.conf import settings
+from django.db import migrations, models
+
+TABLE = "projects_projectstatuslog"
+MONTHS_AHEAD = 3
+
+
+def add_months(month, count):
+    index = month.year * 12 + month.month - 1 + count
+    return datetime.date(index // 12, index % 12 + 1, 1)
+
+
+def create_table(schema_editor, name, apps, *, partitioned):
+    """Create the status log table, either plain or partitioned by month."""
+    user_table = apps.get_model(settings.AUTH_USER_MODEL)._meta.db_table
+    project_table = apps.get_model("projects", "Project")._meta.db_table
+    if partitioned:
+        id_column = f"id bigint NOT NULL DEFAULT nextval('{TABLE}_id_seq')"
+        primary_key = "(id, changed_at)"
+        suffix = "PARTITION BY RANGE (changed_at)"
+    else:
+        id_column = "id bigint NOT NULL GENERATED BY DEFAULT AS IDENTITY"
+        primary_key = "(id)"
+        suffix = ""
+    schema_editor.execute(
+        f"CREATE TABLE {name} ("
+        f"{id_column}, "
+        "old_status varchar(20) NOT NULL, "
+        "new_status varchar(20) NOT NULL, "
+        "changed_at timestamp with time zone NOT NULL, "
+        "comment text NOT NULL, "
+        f"changed_by_id bigint NULL REFERENCES {user_table} (id) "
+        "DEFERRABLE INITIALLY DEFERRED, "
+        f"project_id bigint NOT NULL REFERENCES {project_table} (id) "
+        "DEFERRABLE INITIALLY DEFERRED, "
+        f"CONSTRAINT {TABLE}_pkey PRIMARY KEY {primary_key}"
+        f") {suffix}",
+    )
+
+
+def copy_rows(schema_editor, source):
+    schema_editor.execute(
+        f"INSERT INTO {TABLE} "
+        "(id, old_status, new_status, changed_at, comment, changed_by_id, project_id) "
+        "SELECT id, old_status, new_status, changed_at, comment, changed_by_id, "
+        f"project_id FROM {source}",
+    )
+    schema_editor.execute(
+        f"SELECT setval(pg_get_serial_sequence('{TABLE}', 'id'), "
+        f"COALESCE(MAX(id), 0) + 1, false) FROM {TABLE}",
+    )
+
+
+def partition(apps, schema_editor):
+    """Rebuild the status log as a table partitioned by month of changed_at."""
+    schema_editor.execute(f"ALTER TABLE {TABLE} RENAME TO {TABLE}_old")
+    schema_editor.execute(f"ALTER INDEX {TABLE}_pkey RENAME TO {TABLE}_old_pkey")
+    # Dropping the identity frees the sequence name for the new table.
+    schema_editor.execute(f"ALTER TABLE {TABLE}_old ALTER COLUMN id DROP IDENTITY")
+    schema_editor.execute(f"CREATE SEQUENCE {TABLE}_id_seq AS bigint")
+    create_table(schema_editor, TABLE, apps, partitioned=True)
+    schema_editor.execute(f"ALTER SEQUENCE {TABLE}_id_seq OWNED BY {TABLE}.id")
+    schema_editor.execute(f"CREATE TABLE {TABLE}_default PARTITION OF {TABLE} DEFAULT")
+
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(f"SELECT MIN(changed_at) FROM {TABLE}_old")
+        (oldest,) = cursor.fetchone()
+    today = datetime.datetime.now(tz=datetime.UTC).date().replace(day=1)
+    month = (oldest.astimezone(datetime.UTC).date() if oldest else today).replace(day=1)
+    while month <= add_months(today, MONTHS_AHEAD):
+        end = add_months(month, 1)
+        schema_editor.execute(
+            f"CREATE TABLE {TABLE}_p{month:%Y_%m} PARTITION OF {TABLE} "
+            f"FOR VALUES FROM ('{month} 00:00+00') TO ('{end} 00:00+00')",
+        )
+        month = end
+
+    copy_rows(schema_editor, f"{TABLE}_old")
+    schema_editor.execute(f"DROP TABLE {TABLE}_old")
+    schema_editor.execute(f"CREATE INDEX {TABLE}_changed_by_id ON {TABLE} (changed_by_id)")
+
+
+def unpartition(apps, schema_editor):
+    """Fold all partitions back into a plain table."""
+    schema_editor.execute(f"ALTER TABLE {TABLE} RENAME TO {TABLE}_partitioned")
+    schema_editor.execute(f"ALTER INDEX {TABLE}_pkey RENAME TO {TABLE}_partitioned_pkey")
+    schema_editor.execute(f"ALTER INDEX {TABLE}_changed_by_id RENAME TO {TABLE}_old_changed_by_id")
+    schema_editor.execute(f"ALTER SEQUENCE {TABLE}_id_seq RENAME TO {TABLE}_partitioned_id_seq")
+    create_table(schema_editor, TABLE, apps, partitioned=False)
+    copy_rows(schema_editor, f"{TABLE}_partitioned")
+    schema_editor.execute(f"DROP TABLE {TABLE}_partitioned")
+    schema_editor.execute(f"CREATE INDEX {TABLE}_changed_by_id ON {TABLE} (changed_by_id)")
+    schema_editor.execute(f"CREATE INDEX {TABLE}_project_id ON {TABLE} (project_id)")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0008_keyset_pagination_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(partition, unpartition),
+        migrations.AddIndex(
+            model_name='projectstatuslog',
+            index=models.Index(fields=['project', '-changed_at'], name='projects_statuslog_project_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='projectstatuslog',
+            index=models.Index(fields=['-changed_at'], name='projects_statuslog_changed_idx'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.11 on 2026-10-17 00:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0009_partition_status_log'),
+    ]
+
+    operations = [
+        # Respace existing tasks 1024 (Task.ORDER_GAP) apart, keeping their order.
+        migrations.RunSQL(
+            """
+            UPDATE projects_task AS task
+            SET "order" = ranked.position * 1024
+            FROM (
+                SELECT id, ROW_NUMBER() OVER (
+                    PARTITION BY project_id ORDER BY "order", created_at, id
+                ) AS position
+                FROM projects_task
+            ) AS ranked
+            WHERE task.id = ranked.id
+            """,
+            migrations.RunSQL.noop,
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['project', 'order'], name='projects_task_order_idx'),
+        ),
+    ]
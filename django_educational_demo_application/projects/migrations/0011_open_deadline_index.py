@@ -0,0 +1,17 @@
+# Generated by Django 5.2.11 on 2026-10-17 00:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0010_task_order_gaps'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(condition=models.Q(('status__in', ['draft', 'in_progress', 'review'])), fields=['deadline'], name='projects_project_open_dl_idx'),
+        ),
+    ]
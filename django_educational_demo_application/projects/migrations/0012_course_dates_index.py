@@ -0,0 +1,17 @@
+# Generated by Django 5.2.11 on 2026-10-17 00:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0011_open_deadline_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='course',
+            index=models.Index(fields=['start_date', 'end_date'], name='projects_course_dates_idx'),
+        ),
+    ]
@@ -1,17 +1,95 @@
 """Educational project management domain models."""
 
+import datetime
+import itertools
+import re
+from collections import Counter
+from collections.abc import Iterable
+from operator import attrgetter
+from typing import NamedTuple
+
 from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchQuery
+from django.contrib.postgres.search import SearchRank
+from django.contrib.postgres.search import SearchVector
+from django.contrib.postgres.search import SearchVectorField
+from django.contrib.postgres.search import TrigramSimilarity
 from django.core.validators import MaxValueValidator
 from django.core.validators import MinValueValidator
+from django.db import connections
 from django.db import models
+from django.db import router
+from django.db import transaction
+from django.db.models import Avg
+from django.db.models import BooleanField
+from django.db.models import Case
+from django.db.models import Count
+from django.db.models import F
+from django.db.models import OuterRef
+from django.db.models import Q
+from django.db.models import Subquery
+from django.db.models import Sum
+from django.db.models import Value
+from django.db.models import When
+from django.db.models import Window
+from django.db.models.functions import Coalesce
+from django.db.models.functions import Lag
 from django.urls import reverse
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
+from .cache import bump_task_progress
+from .cache import bump_versions
+from .metrics import record_transitions
+
+
+class CourseQuerySet(models.QuerySet):
+    """QuerySet with date-based course status helpers."""
+
+    def with_status(self, today: datetime.date | None = None) -> "CourseQuerySet":
+        """Annotate ``current_status``, the status computed by the database."""
+        today = today or timezone.now().date()
+        return self.annotate(
+            current_status=Case(
+                When(start_date__gt=today, then=Value("upcoming")),
+                When(end_date__lt=today, then=Value("completed")),
+                default=Value("active"),
+                output_field=models.CharField(),
+            ),
+        )
+
+    def filter_status(
+        self,
+        status: str,
+        today: datetime.date | None = None,
+    ) -> "CourseQuerySet":
+        """
+        Return courses in ``status`` on ``today``.
+
+        The date comparisons are used directly rather than the annotation, so
+        the ``(start_date, end_date)`` index can serve them.
+        """
+        today = today or timezone.now().date()
+        if status == "upcoming":
+            return self.filter(start_date__gt=today)
+        if status == "completed":
+            return self.filter(end_date__lt=today)
+        if status == "active":
+            return self.filter(start_date__lte=today, end_date__gte=today)
+        msg = f"Unknown course status: {status!r}"
+        raise ValueError(msg)
+
 
 class Course(models.Model):
     """Educational course model."""
 
+    STATUS_CHOICES = [
+        ("upcoming", _("Upcoming")),
+        ("active", _("Active")),
+        ("completed", _("Completed")),
+    ]
+
     name = models.CharField(max_length=255, db_index=True)
     code = models.CharField(max_length=50, unique=True, db_index=True)
     description = models.TextField(blank=True)
@@ -19,10 +97,24 @@ class Course(models.Model):
     end_date = models.DateField()
     is_active = models.BooleanField(default=True)
 
+    objects = CourseQuerySet.as_manager()
+
     class Meta:
         ordering = ["-start_date"]
         verbose_name = _("Course")
         verbose_name_plural = _("Courses")
+        indexes = [
+            # Serves keyset pagination in both directions.
+            models.Index(
+                fields=["start_date", "id"],
+                name="projects_course_keyset_idx",
+            ),
+            # Serves status filters, which are date range comparisons.
+            models.Index(
+                fields=["start_date", "end_date"],
+                name="projects_course_dates_idx",
+            ),
+        ]
 
     def __str__(self) -> str:
         return f"{self.code} - {self.name}"
@@ -37,7 +129,14 @@ class Course(models.Model):
 
     @property
     def status(self) -> str:
-        """Return course status: upcoming, active, or completed."""
+        """
+        Return course status: upcoming, active, or completed.
+
+        Uses the ``current_status`` annotation of ``with_status`` when present.
+        """
+        annotated = getattr(self, "current_status", None)
+        if annotated is not None:
+            return annotated
         today = timezone.now().date()
         if today < self.start_date:
             return "upcoming"
@@ -45,6 +144,9 @@ class Course(models.Model):
             return "completed"
         return "active"
 
+    def get_status_display(self) -> str:
+        return dict(self.STATUS_CHOICES)[self.status]
+
     def get_student_count(self) -> int:
         """Return number of enrolled students."""
         return self.enrollments.count()
@@ -54,6 +156,26 @@ class Course(models.Model):
         return self.projects.count()
 
 
+class StudentQuerySet(models.QuerySet):
+    """Query helpers for students."""
+
+    STUDENT_ID_PATTERN = re.compile(r"STU\d+", re.IGNORECASE)
+
+    def search(self, text: str) -> "StudentQuerySet":
+        """
+        Filter students by username, student id or group.
+
+        Anything that looks like a student id is matched as a prefix of
+        ``student_id``, which the column's ``varchar_pattern_ops`` index serves
+        directly. Other terms are matched against the lowercased
+        ``search_key`` through its trigram index.
+        """
+        text = text.strip()
+        if self.STUDENT_ID_PATTERN.fullmatch(text):
+            return self.filter(student_id__startswith=text.upper())
+        return self.filter(search_key__contains=text.lower())
+
+
 class Student(models.Model):
     """Student profile model."""
 
@@ -65,15 +187,41 @@ class Student(models.Model):
     student_id = models.CharField(max_length=50, unique=True, db_index=True)
     group = models.CharField(max_length=50, blank=True)
     enrolled_at = models.DateTimeField(auto_now_add=True)
+    # Lowercased "username student_id group", kept in sync on save so search
+    # needs neither the users join nor case folding at query time.
+    search_key = models.CharField(max_length=512, blank=True, editable=False)
+
+    SEARCH_KEY_SOURCES = frozenset({"user", "user_id", "student_id", "group"})
+
+    objects = StudentQuerySet.as_manager()
 
     class Meta:
         ordering = ["user__username"]
         verbose_name = _("Student")
         verbose_name_plural = _("Students")
+        indexes = [
+            GinIndex(
+                fields=["search_key"],
+                name="projects_student_search_idx",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ]
 
     def __str__(self) -> str:
         return f"{self.user.username} ({self.student_id})"
 
+    def save(self, *args, **kwargs):
+        """Refresh the search key before saving."""
+        self.search_key = self.build_search_key(
+            self.user.username,
+            self.student_id,
+            self.group,
+        )
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and self.SEARCH_KEY_SOURCES & set(update_fields):
+            kwargs["update_fields"] = {*update_fields, "search_key"}
+        super().save(*args, **kwargs)
+
     def get_absolute_url(self) -> str:
         return reverse("projects:student_detail", kwargs={"pk": self.pk})
 
@@ -86,11 +234,19 @@ class Student(models.Model):
         return self.projects.filter(status="completed")
 
     def get_average_score(self) -> float | None:
-        """Calculate average score across all graded projects."""
-        graded = self.projects.exclude(score__isnull=True)
-        if graded.exists():
-            return graded.aggregate(models.Avg("score"))["score__avg"]
-        return None
+        """
+        Return average score across all graded projects from the rollup.
+
+        The row is created with the student; a missing one reads as no graded
+        projects until ``rebuild_student_stats`` runs.
+        """
+        stats = getattr(self, "stats", None)
+        return None if stats is None else stats.average_score
+
+    @staticmethod
+    def build_search_key(username: str, student_id: str, group: str) -> str:
+        """Return the normalized text that student search matches against."""
+        return " ".join(part for part in (username, student_id, group) if part).lower()
 
 
 class Enrollment(models.Model):
@@ -119,6 +275,245 @@ class Enrollment(models.Model):
         return f"{self.student} in {self.course}"
 
 
+class ProjectState(NamedTuple):
+    """The project columns that per-course statistics are derived from."""
+
+    course_id: int
+    student_id: int
+    status: str
+    score: int | None
+    deadline: datetime.date | None
+
+    def is_overdue(self, today: datetime.date) -> bool:
+        """Return True if the project is open and past its deadline."""
+        return (
+            self.deadline is not None
+            and self.status in Project.OPEN_STATUSES
+            and self.deadline < today
+        )
+
+
+def write_alias(queryset: models.QuerySet) -> str:
+    """
+    Return the database alias ``queryset`` writes to.
+
+    ``QuerySet.db`` only resolves to the write alias once Django has marked the
+    queryset for writing, so reads and writes issued alongside a bulk write
+    would otherwise follow the read alias, which may be the replica.
+    """
+    return queryset._db or router.db_for_write(queryset.model, **queryset._hints)  # noqa: SLF001
+
+
+def shift_counters(
+    model: type[models.Model],
+    key: str,
+    deltas: dict[int, Counter],
+    *,
+    assignments: dict[str, str] | None = None,
+    params: Iterable = (),
+) -> None:
+    """
+    Add per-row counter deltas to rows of ``model`` in a single UPDATE.
+
+    ``deltas`` maps values of the ``key`` column to the deltas of the model's
+    ``COUNTER_FIELDS``; rows whose deltas are all zero are left out. The
+    deltas are passed as arrays and joined through ``unnest``, so the
+    statement is the same for one row or thousands. ``assignments`` replaces
+    or adds SET expressions, written against ``stats`` (the row) and ``d``
+    (its deltas), and ``params`` fills their placeholders.
+    """
+    fields = model.COUNTER_FIELDS
+    rows = [(pk, delta) for pk, delta in deltas.items() if any(delta.values())]
+    if not rows:
+        return
+
+    connection = connections[router.db_for_write(model)]
+    quote = connection.ops.quote_name
+    table = quote(model._meta.db_table)  # noqa: SLF001
+    sets = {field: f"stats.{quote(field)} + d.{quote(field)}" for field in fields}
+    sets.update(assignments or {})
+    columns = ", ".join(quote(column) for column in (key, *fields))
+    arrays = ", ".join(["%s::bigint[]"] * (len(fields) + 1))
+    sql = (
+        f"UPDATE {table} AS stats SET "  # noqa: S608
+        + ", ".join(f"{quote(field)} = {value}" for field, value in sets.items())
+        + f" FROM unnest({arrays}) AS d({columns}) "
+        f"WHERE stats.{quote(key)} = d.{quote(key)}"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(
+            sql,
+            [
+                *params,
+                [pk for pk, _delta in rows],
+                *([delta[field] for _pk, delta in rows] for field in fields),
+            ],
+        )
+
+
+class ProjectQuerySet(models.QuerySet):
+    """QuerySet with search and denormalized column helpers for projects."""
+
+    def search(self, text: str) -> "ProjectQuerySet":
+        """
+        Full-text search over title and description, ranked by relevance.
+
+        Titles also match by trigram similarity so that typos still find the
+        project. Both predicates are served by GIN indexes.
+        """
+        query = SearchQuery(
+            text,
+            config="russian",
+            search_type="websearch",
+        ) | SearchQuery(text, config="english", search_type="websearch")
+        return (
+            self.filter(Q(search_vector=query) | Q(title__trigram_similar=text))
+            .annotate(
+                search_rank=SearchRank(F("search_vector"), query)
+                + TrigramSimilarity("title", text),
+            )
+            .order_by("-search_rank", "-created_at")
+        )
+
+    def bulk_transition(
+        self,
+        new_status: str,
+        *,
+        user=None,
+        comment: str = "",
+    ) -> list[int]:
+        """
+        Move the selected projects to ``new_status`` and return the moved ids.
+
+        Transitions are validated in memory. Each source status is then
+        applied with one ``UPDATE ... WHERE id = ANY(...) AND status = old``,
+        so a project changed concurrently is skipped rather than overwritten.
+        Statistics and the status log are written in batches. Like
+        ``Project.transition_to``, completing sets a missing score to 0.
+        """
+        # The statuses are validated against the rows about to be updated, so
+        # they are read where the update goes too.
+        using = write_alias(self)
+        by_status: dict[str, list[ProjectState]] = {}
+        ids: dict[str, list[int]] = {}
+        rows = self.using(using).order_by().values_list("pk", *ProjectState._fields)
+        for pk, *values in rows:
+            state = ProjectState(*values)
+            if Project.is_allowed_transition(state.status, new_status):
+                by_status.setdefault(state.status, []).append(state)
+                ids.setdefault(state.status, []).append(pk)
+        if not ids:
+            return []
+
+        connection = connections[using]
+        table = connection.ops.quote_name(self.model._meta.db_table)  # noqa: SLF001
+        completing = new_status == "completed"
+        now = timezone.now()
+        moved: list[int] = []
+        changes = []
+        with transaction.atomic(using=using, savepoint=False):
+            with connection.cursor() as cursor:
+                for old_status, pks in ids.items():
+                    cursor.execute(
+                        f"UPDATE {table} SET status = %s, updated_at = %s, "  # noqa: S608
+                        "score = CASE WHEN %s THEN COALESCE(score, 0) "
+                        "ELSE score END, "
+                        "completed_at = CASE WHEN %s "
+                        "THEN COALESCE(completed_at, %s) END "
+                        "WHERE id = ANY(%s) AND status = %s RETURNING id",
+                        [new_status, now, completing, completing, now, pks, old_status],
+                    )
+                    updated = {row[0] for row in cursor.fetchall()}
+                    for pk, old in zip(pks, by_status[old_status], strict=True):
+                        if pk not in updated:
+                            continue
+                        score = old.score
+                        if completing and score is None:
+                            score = 0
+                        moved.append(pk)
+                        new = old._replace(status=new_status, score=score)
+                        changes.append((old, new))
+
+            CourseStats.record_changes(changes)
+            StudentStats.record_changes(changes)
+            changed_by = user.user if hasattr(user, "user") else user
+            ProjectStatusLog.objects.using(using).bulk_create(
+                [
+                    ProjectStatusLog(
+                        project_id=pk,
+                        old_status=old.status,
+                        new_status=new_status,
+                        changed_by=changed_by,
+                        comment=comment,
+                    )
+                    for pk, (old, _new) in zip(moved, changes, strict=True)
+                ],
+                batch_size=1000,
+            )
+            bump_versions(course_ids={old.course_id for old, _new in changes})
+            record_transitions(
+                [old.status for old, _new in changes],
+                new_status,
+                using=using,
+            )
+        return moved
+
+    def shift_task_counters(self, *, total: int = 0, completed: int = 0) -> int:
+        """Atomically add deltas to the task counters of the selected projects."""
+        return self.update(
+            task_count=F("task_count") + total,
+            completed_task_count=F("completed_task_count") + completed,
+        )
+
+    def overdue(self, today: datetime.date | None = None) -> "ProjectQuerySet":
+        """Return open projects past their deadline, via the partial deadline index."""
+        return self.filter(Project.overdue_condition(today))
+
+    def with_overdue(self, today: datetime.date | None = None) -> "ProjectQuerySet":
+        """Annotate ``overdue``, the overdue state computed by the database."""
+        return self.annotate(
+            overdue=Case(
+                When(Project.overdue_condition(today), then=True),
+                default=False,
+                output_field=BooleanField(),
+            ),
+        )
+
+    def with_last_task_order(self) -> "ProjectQuerySet":
+        """Annotate ``last_task_order``, the highest task order or 0."""
+        last = (
+            Task.objects.filter(project=OuterRef("pk"))
+            .order_by("-order")
+            .values("order")[:1]
+        )
+        return self.annotate(last_task_order=Coalesce(Subquery(last), 0))
+
+    def refresh_task_counters(self) -> int:
+        """Recompute task counters of the selected projects from their tasks."""
+        tasks = Task.objects.filter(project=OuterRef("pk")).order_by().values("project")
+        return self.update(
+            task_count=Coalesce(
+                Subquery(tasks.annotate(count=Count("pk")).values("count")),
+                0,
+            ),
+            completed_task_count=Coalesce(
+                Subquery(
+                    tasks.filter(is_completed=True)
+                    .annotate(count=Count("pk"))
+                    .values("count"),
+                ),
+                0,
+            ),
+        )
+
+
+class ProjectManager(models.Manager.from_queryset(ProjectQuerySet)):
+    """Default manager that leaves the search vector out of regular loads."""
+
+    def get_queryset(self) -> ProjectQuerySet:
+        return super().get_queryset().defer("search_vector")
+
+
 class Project(models.Model):
     """Educational project model with status workflow."""
 
@@ -136,6 +531,17 @@ class Project(models.Model):
         ("high", _("High")),
     ]
 
+    # Statuses in which a project can still become overdue.
+    OPEN_STATUSES = ("draft", "in_progress", "review")
+
+    ALLOWED_TRANSITIONS = {
+        "draft": ("in_progress", "archived"),
+        "in_progress": ("review", "draft", "archived"),
+        "review": ("completed", "in_progress", "draft"),
+        "completed": ("in_progress", "archived"),
+        "archived": ("draft",),
+    }
+
     title = models.CharField(max_length=255, db_index=True)
     description = models.TextField()
     course = models.ForeignKey(
@@ -170,6 +576,27 @@ class Project(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     deadline = models.DateField(null=True, blank=True)
     completed_at = models.DateTimeField(null=True, blank=True)
+    # Maintained by Task.save, the Task post_delete signal and TaskQuerySet
+    # bulk operations, so progress can be rendered without touching tasks.
+    task_count = models.PositiveIntegerField(default=0, editable=False)
+    completed_task_count = models.PositiveIntegerField(default=0, editable=False)
+
+    # The site is Russian-first with English content, so both configs are
+    # indexed; see ProjectQuerySet.search.
+    search_vector = models.GeneratedField(
+        expression=(
+            SearchVector("title", config="russian", weight="A")
+            + SearchVector("title", config="english", weight="A")
+            + SearchVector("description", config="russian", weight="B")
+            + SearchVector("description", config="english", weight="B")
+        ),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+
+    TASK_COUNTER_FIELDS = ("task_count", "completed_task_count")
+
+    objects = ProjectManager()
 
     class Meta:
         ordering = ["-created_at"]
@@ -178,61 +605,245 @@ class Project(models.Model):
         indexes = [
             models.Index(fields=["status", "created_at"]),
             models.Index(fields=["course", "status"]),
+            # Overdue lookups; the condition matches Project.OPEN_STATUSES.
+            models.Index(
+                fields=["deadline"],
+                name="projects_project_open_dl_idx",
+                condition=Q(status__in=["draft", "in_progress", "review"]),
+            ),
+            models.Index(
+                fields=["created_at", "id"],
+                name="projects_project_keyset_idx",
+            ),
+            GinIndex(fields=["search_vector"], name="projects_search_vector_idx"),
+            GinIndex(
+                fields=["title"],
+                name="projects_title_trgm_idx",
+                opclasses=["gin_trgm_ops"],
+            ),
         ]
 
     def __str__(self) -> str:
         return f"{self.title} ({self.student.user.username})"
 
     def save(self, *args, **kwargs) -> None:
-        """Auto-update completed_at when status changes to completed."""
-        if self.status == "completed" and not self.completed_at:
-            self.completed_at = timezone.now()
-        elif self.status != "completed":
-            self.completed_at = None
-        super().save(*args, **kwargs)
+        """
+        Auto-update completed_at when status changes to completed.
+
+        Task counters are never written back from memory on update (see
+        ``_do_update``), so a stale instance cannot overwrite counts maintained
+        by concurrent task writes. Course and student statistics are shifted in
+        the same transaction.
+        """
+        if "status" not in self.get_deferred_fields():
+            if self.status == "completed" and not self.completed_at:
+                self.completed_at = timezone.now()
+            elif self.status != "completed":
+                self.completed_at = None
+        adding = self._state.adding
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            written = {self._meta.get_field(name).attname for name in update_fields}
+        else:
+            # Like Model.save, deferred fields are only written once loaded.
+            written = {field.attname for field in self._meta.concrete_fields}
+            written -= self.get_deferred_fields()
+
+        old = None if adding else self.persisted_state
+        with transaction.atomic(using=kwargs.get("using"), savepoint=False):
+            super().save(*args, **kwargs)
+            if not written & set(ProjectState._fields):
+                return
+            new = self.state
+            self._persisted = new
+            if not adding and old is None:
+                # Previous state is unknown, rebuild instead of guessing.
+                CourseStats.rebuild(course_ids=[self.course_id])
+                StudentStats.rebuild(student_ids=[self.student_id])
+                return
+            CourseStats.record_changes([(old, new)])
+            StudentStats.record_changes([(old, new)])
 
     def get_absolute_url(self) -> str:
         return reverse("projects:project_detail", kwargs={"pk": self.pk})
 
+    def _do_update(self, base_qs, using, pk_val, values, *args, **kwargs) -> bool:
+        """Leave the task counters out of the fields Model.save would update."""
+        values = [
+            value for value in values if value[0].name not in self.TASK_COUNTER_FIELDS
+        ]
+        return super()._do_update(base_qs, using, pk_val, values, *args, **kwargs)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Remember the persisted state used for statistics deltas."""
+        instance = super().from_db(db, field_names, values)
+        if set(ProjectState._fields) <= set(field_names):
+            instance._persisted = instance.state  # noqa: SLF001
+        return instance
+
+    @classmethod
+    def is_allowed_transition(cls, old_status: str, new_status: str) -> bool:
+        """Check if the workflow allows moving from one status to another."""
+        return new_status in cls.ALLOWED_TRANSITIONS.get(old_status, ())
+
     def can_transition_to(self, new_status: str) -> bool:
         """Check if status transition is valid."""
-        allowed_transitions = {
-            "draft": ["in_progress", "archived"],
-            "in_progress": ["review", "draft", "archived"],
-            "review": ["completed", "in_progress", "draft"],
-            "completed": ["in_progress", "archived"],
-            "archived": ["draft"],
-        }
-        return new_status in allowed_transitions.get(self.status, [])
+        return self.is_allowed_transition(self.status, new_status)
 
-    def transition_to(self, new_status: str, user=None) -> bool:
+    def transition_to(self, new_status: str, user=None, comment: str = "") -> bool:
         """
         Transition project to new status with validation.
 
-        Returns True if transition was successful, False otherwise.
+        The update, the status log entry and the statistics deltas run as a
+        single statement that only matches while the row still has the
+        status this instance was loaded with, so of two concurrent
+        transitions exactly one wins. Returns True if the transition was
+        applied, False if it is not allowed or the status changed meanwhile.
         """
         if not self.can_transition_to(new_status):
             return False
 
-        self.status = new_status
-        if new_status == "completed" and self.score is None:
-            self.score = 0
-        self.save()
-
-        ProjectStatusLog.objects.create(
-            project=self,
-            old_status=self.status,
-            new_status=new_status,
-            changed_by=user.user if hasattr(user, "user") else user,
+        # Like Model.save, write through the router rather than to the alias
+        # the instance was read from, which may be the replica.
+        using = router.db_for_write(Project, instance=self)
+        sql, params = self._transition_statement(
+            connections[using],
+            new_status,
+            user,
+            comment,
         )
+        with connections[using].cursor() as cursor:
+            cursor.execute(sql, params)
+            row = cursor.fetchone()
+        if row is None:
+            return False
+
+        old_status = self.status
+        self.status = new_status
+        self.score, self.completed_at, self.updated_at = row
+        self._persisted = self.state
+        bump_versions(course_ids=[self.course_id])
+        record_transitions([old_status], new_status, using=using)
         return True
 
+    def _transition_statement(self, connection, new_status: str, user, comment: str):
+        """Build the SQL and parameters of the statement run by transition_to."""
+        quote = connection.ops.quote_name
+        project_table, log_table, course_table, student_table = (
+            quote(model._meta.db_table)  # noqa: SLF001
+            for model in (Project, ProjectStatusLog, CourseStats, StudentStats)
+        )
+        now = timezone.now()
+        today = now.date()
+        old_status = self.status
+
+        # Status-only contributions; score and deadline deltas need the
+        # locked row and are computed in SQL.
+        old = ProjectState(self.course_id, self.student_id, old_status, None, None)
+        new = old._replace(status=new_status)
+        course_delta = CourseStats.contribution(new, today)
+        course_delta.subtract(CourseStats.contribution(old, today))
+        student_delta = StudentStats.contribution(new)
+        student_delta.subtract(StudentStats.contribution(old))
+        overdue_delta = int(new_status in self.OPEN_STATUSES) - int(
+            old_status in self.OPEN_STATUSES,
+        )
+
+        def shifts(delta: Counter) -> str:
+            return "".join(
+                f"{quote(field)} = stats.{quote(field)} + {int(value)}, "
+                for field, value in delta.items()
+                if value
+            )
+
+        changed_by = user.user if hasattr(user, "user") else user
+        sql = (
+            "WITH old AS ("  # noqa: S608
+            f"SELECT id, score FROM {project_table} "
+            "WHERE id = %(pk)s AND status = %(old_status)s FOR UPDATE"
+            "), moved AS ("
+            f"UPDATE {project_table} AS project "
+            "SET status = %(new_status)s, updated_at = %(now)s, "
+            "score = CASE WHEN %(completing)s THEN COALESCE(project.score, 0) "
+            "ELSE project.score END, "
+            "completed_at = CASE WHEN %(completing)s "
+            "THEN COALESCE(project.completed_at, %(now)s) END "
+            "FROM old WHERE project.id = old.id "
+            "RETURNING project.id, project.course_id, project.student_id, "
+            "project.score, project.completed_at, project.updated_at, "
+            "COALESCE(project.deadline < %(today)s, false) AS past_deadline, "
+            "(project.score IS NOT NULL)::int - (old.score IS NOT NULL)::int "
+            "AS graded_delta, "
+            "COALESCE(project.score, 0) - COALESCE(old.score, 0) AS score_delta"
+            "), logged AS ("
+            f"INSERT INTO {log_table} "
+            "(project_id, old_status, new_status, changed_at, changed_by_id, comment) "
+            "SELECT id, %(old_status)s, %(new_status)s, %(now)s, %(changed_by)s, "
+            "%(comment)s FROM moved"
+            "), course_stats AS ("
+            f"UPDATE {course_table} AS stats SET "
+            f"{shifts(course_delta)}"
+            "graded_count = stats.graded_count + moved.graded_delta, "
+            "score_sum = stats.score_sum + moved.score_delta, "
+            "overdue_count = stats.overdue_count + CASE WHEN moved.past_deadline "
+            "AND stats.overdue_computed_on = %(today)s "
+            "THEN %(overdue_delta)s ELSE 0 END "
+            "FROM moved WHERE stats.course_id = moved.course_id"
+            "), student_stats AS ("
+            f"UPDATE {student_table} AS stats SET "
+            f"{shifts(student_delta)}"
+            "graded_count = stats.graded_count + moved.graded_delta, "
+            "score_sum = stats.score_sum + moved.score_delta, "
+            "average_score = (stats.score_sum + moved.score_delta)::float "
+            "/ NULLIF(stats.graded_count + moved.graded_delta, 0) "
+            "FROM moved WHERE stats.student_id = moved.student_id"
+            ") SELECT score, completed_at, updated_at FROM moved"
+        )
+        params = {
+            "pk": self.pk,
+            "old_status": old_status,
+            "new_status": new_status,
+            "completing": new_status == "completed",
+            "now": now,
+            "today": today,
+            "changed_by": changed_by.pk if changed_by is not None else None,
+            "comment": comment,
+            "overdue_delta": overdue_delta,
+        }
+        return sql, params
+
+    @property
+    def state(self) -> ProjectState:
+        """Return the current in-memory statistics state."""
+        return ProjectState(
+            course_id=self.course_id,
+            student_id=self.student_id,
+            status=self.status,
+            score=self.score,
+            deadline=self.deadline,
+        )
+
+    @property
+    def persisted_state(self) -> ProjectState | None:
+        """Return the statistics state as last read from or written to the DB."""
+        return getattr(self, "_persisted", None)
+
     @property
     def is_overdue(self) -> bool:
-        """Check if project is past deadline."""
-        if self.deadline and self.status not in ["completed", "archived"]:
-            return timezone.now().date() > self.deadline
-        return False
+        """Check if project is past deadline, preferring the ``overdue`` annotation."""
+        overdue = getattr(self, "overdue", None)
+        if overdue is not None:
+            return overdue
+        return self.state.is_overdue(timezone.now().date())
+
+    @classmethod
+    def overdue_condition(cls, today: datetime.date | None = None) -> Q:
+        """Return the filter matching open projects past their deadline on ``today``."""
+        return Q(
+            deadline__lt=today or timezone.now().date(),
+            status__in=cls.OPEN_STATUSES,
+        )
 
     @property
     def days_until_deadline(self) -> int | None:
@@ -241,13 +852,18 @@ class Project(models.Model):
             return (self.deadline - timezone.now().date()).days
         return None
 
+    @property
+    def days_overdue(self) -> int:
+        """Return days past the deadline, or 0 if it has not passed."""
+        return max(-(self.days_until_deadline or 0), 0)
+
     def get_task_count(self) -> int:
         """Return number of tasks in this project."""
-        return self.tasks.count()
+        return self.task_count
 
     def get_completed_task_count(self) -> int:
         """Return number of completed tasks."""
-        return self.tasks.filter(is_completed=True).count()
+        return self.completed_task_count
 
     @property
     def progress_percentage(self) -> int:
@@ -258,6 +874,138 @@ class Project(models.Model):
         return int((self.get_completed_task_count() / total) * 100)
 
 
+class TaskQuerySet(models.QuerySet):
+    """QuerySet that keeps project task counters correct for bulk writes."""
+
+    COUNTED_FIELDS = frozenset({"is_completed", "project", "project_id"})
+
+    def bulk_create(self, objs, *args, **kwargs):
+        """Insert tasks and shift the counters of their projects in one go."""
+        objs = list(objs)
+        using = write_alias(self)
+        with transaction.atomic(using=using, savepoint=False):
+            created = super().bulk_create(objs, *args, **kwargs)
+            bump_task_progress(task.project_id for task in objs)
+            projects = Project.objects.using(using)
+            if kwargs.get("ignore_conflicts") or kwargs.get("update_conflicts"):
+                # Which rows were actually inserted is unknown, recount instead.
+                projects.filter(
+                    pk__in={task.project_id for task in objs},
+                ).refresh_task_counters()
+                return created
+
+            deltas: dict[int, list[int]] = {}
+            for task in created:
+                delta = deltas.setdefault(task.project_id, [0, 0])
+                delta[0] += 1
+                delta[1] += int(task.is_completed)
+            for project_id, (total, completed) in deltas.items():
+                projects.filter(pk=project_id).shift_task_counters(
+                    total=total,
+                    completed=completed,
+                )
+        return created
+
+    def update(self, **kwargs) -> int:
+        """Update tasks, recounting affected projects when counted fields change."""
+        if not self.COUNTED_FIELDS & kwargs.keys():
+            return super().update(**kwargs)
+
+        using = write_alias(self)
+        with transaction.atomic(using=using, savepoint=False):
+            project_ids = set(self.using(using).values_list("project_id", flat=True))
+            rows = super().update(**kwargs)
+            new_project = kwargs.get("project", kwargs.get("project_id"))
+            if new_project is not None:
+                project_ids.add(getattr(new_project, "pk", new_project))
+            bump_task_progress(project_ids)
+            Project.objects.using(using).filter(
+                pk__in=project_ids,
+            ).refresh_task_counters()
+        return rows
+
+    def toggle_completion(self, pk: int) -> tuple[bool, datetime.datetime | None]:
+        """
+        Flip ``is_completed`` of one task and return its new state.
+
+        The task and its project's ``completed_task_count`` are updated by a
+        single statement, so no row is read first and no Python-side state
+        can go stale. Raises ``Task.DoesNotExist`` for an unknown ``pk``.
+        """
+        connection = connections[write_alias(self)]
+        quote = connection.ops.quote_name
+        task_table, project_table = (
+            quote(model._meta.db_table)  # noqa: SLF001
+            for model in (Task, Project)
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "WITH toggled AS ("  # noqa: S608
+                f"UPDATE {task_table} SET is_completed = NOT is_completed, "
+                "completed_at = CASE WHEN is_completed THEN NULL ELSE %s END "
+                "WHERE id = %s RETURNING project_id, is_completed, completed_at"
+                "), counted AS ("
+                f"UPDATE {project_table} AS project "
+                "SET completed_task_count = project.completed_task_count "
+                "+ CASE WHEN toggled.is_completed THEN 1 ELSE -1 END "
+                "FROM toggled WHERE project.id = toggled.project_id"
+                ") SELECT project_id, is_completed, completed_at FROM toggled",
+                [timezone.now(), pk],
+            )
+            row = cursor.fetchone()
+        if row is None:
+            msg = f"Task {pk} does not exist."
+            raise Task.DoesNotExist(msg)
+        project_id, is_completed, completed_at = row
+        bump_task_progress([project_id])
+        return is_completed, completed_at
+
+    def renumber(self) -> int:
+        """
+        Respace the selected tasks ``Task.ORDER_GAP`` apart within each project.
+
+        The current ``order, created_at`` sequence is kept. Only tasks whose
+        order changes are written, with one ``bulk_update``; returns their
+        number.
+        """
+        tasks = self.order_by("project_id", "order", "created_at", "pk").only(
+            "pk",
+            "project_id",
+            "order",
+        )
+        changed = []
+        projects = itertools.groupby(tasks, key=attrgetter("project_id"))
+        for _project_id, group in projects:
+            for position, task in enumerate(group, start=1):
+                if task.order != position * Task.ORDER_GAP:
+                    task.order = position * Task.ORDER_GAP
+                    changed.append(task)
+        self.model.objects.using(self.db).bulk_update(
+            changed,
+            ["order"],
+            batch_size=1000,
+        )
+        return len(changed)
+
+    def crowded_project_ids(self, min_gap: int = 2) -> set[int]:
+        """
+        Return projects with neighbouring tasks less than ``min_gap`` apart.
+
+        The first task counts as following an order of 0, so there must be
+        room to move a task in front of it as well.
+        """
+        previous = Window(
+            Lag("order", default=0),
+            partition_by=F("project_id"),
+            order_by=[F("order").asc(), F("created_at").asc(), F("pk").asc()],
+        )
+        return set(
+            self.annotate(gap=F("order") - previous)
+            .filter(gap__lt=min_gap)
+            .values_list("project_id", flat=True),
+        )
+
+
 class Task(models.Model):
     """Task within a project."""
 
@@ -273,25 +1021,126 @@ class Task(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     completed_at = models.DateTimeField(null=True, blank=True)
 
+    # Orders are spaced this far apart, so a task moved between two
+    # neighbours takes the midpoint and no other row is rewritten.
+    ORDER_GAP = 1024
+
+    objects = TaskQuerySet.as_manager()
+
     class Meta:
         ordering = ["order", "created_at"]
         verbose_name = _("Task")
         verbose_name_plural = _("Tasks")
+        indexes = [
+            models.Index(fields=["project", "order"], name="projects_task_order_idx"),
+        ]
 
     def __str__(self) -> str:
         return f"{self.title} ({self.project.title})"
 
     def save(self, *args, **kwargs) -> None:
-        """Auto-update completed_at when task is completed."""
+        """Auto-update completed_at and keep project task counters in sync."""
         if self.is_completed and not self.completed_at:
             self.completed_at = timezone.now()
         elif not self.is_completed:
             self.completed_at = None
-        super().save(*args, **kwargs)
+
+        adding = self._state.adding
+        old = None if adding else self.persisted_state
+        with transaction.atomic(using=kwargs.get("using"), savepoint=False):
+            super().save(*args, **kwargs)
+            if not adding and old is None:
+                # Instance was not loaded from the DB, so its previous state
+                # is unknown: recount instead of guessing a delta.
+                self._persisted = (self.project_id, self.is_completed)
+                Project.objects.filter(pk=self.project_id).refresh_task_counters()
+                return
+            self._shift_project_counters(old, (self.project_id, self.is_completed))
+
+    def move_after(self, previous: "Task | None") -> None:
+        """
+        Place the task right after ``previous``, or first when it is None.
+
+        Normally only this task's order is written. When the neighbours are
+        too close to fit it between them, the project's tasks are renumbered
+        first. Callers serialize moves by locking the project row.
+        """
+        order = self._order_after(previous)
+        if order is None:
+            Task.objects.filter(project_id=self.project_id).renumber()
+            if previous is not None:
+                previous.refresh_from_db(fields=["order"])
+            order = self._order_after(previous)
+        Task.objects.filter(pk=self.pk).update(order=order)
+        self.order = order
+
+    def _order_after(self, previous: "Task | None") -> int | None:
+        """Return a free order right after ``previous``, or None if there is no gap."""
+        lower = previous.order if previous is not None else 0
+        following = Task.objects.filter(
+            project_id=self.project_id,
+            order__gte=lower,
+        ).exclude(pk=self.pk)
+        if previous is not None:
+            following = following.exclude(pk=previous.pk)
+        upper = following.order_by("order").values_list("order", flat=True).first()
+        if upper is None:
+            return lower + self.ORDER_GAP
+        if upper - lower < 2:  # noqa: PLR2004
+            return None
+        return (lower + upper) // 2
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Remember the persisted state used for project counter deltas."""
+        instance = super().from_db(db, field_names, values)
+        if {"project_id", "is_completed"} <= set(field_names):
+            instance._persisted = (instance.project_id, instance.is_completed)  # noqa: SLF001
+        return instance
+
+    @property
+    def persisted_state(self) -> tuple[int, bool] | None:
+        """Return (project_id, is_completed) as last read from or written to the DB."""
+        return getattr(self, "_persisted", None)
+
+    def _shift_project_counters(
+        self,
+        old: tuple[int, bool] | None,
+        new: tuple[int, bool],
+    ) -> None:
+        """Apply the difference between two (project_id, is_completed) states."""
+        self._persisted = new
+        if old == new:
+            return
+        deltas: dict[int, list[int]] = {}
+        if old is not None:
+            delta = deltas.setdefault(old[0], [0, 0])
+            delta[0] -= 1
+            delta[1] -= int(old[1])
+        delta = deltas.setdefault(new[0], [0, 0])
+        delta[0] += 1
+        delta[1] += int(new[1])
+
+        for project_id, (total, completed) in deltas.items():
+            if total == completed == 0:
+                continue
+            Project.objects.filter(pk=project_id).shift_task_counters(
+                total=total,
+                completed=completed,
+            )
+            if Task.project.is_cached(self) and self.project.pk == project_id:
+                self.project.task_count += total
+                self.project.completed_task_count += completed
 
 
 class ProjectStatusLog(models.Model):
-    """Log of project status changes for audit trail."""
+    """
+    Log of project status changes for audit trail.
+
+    The table is range-partitioned by month of ``changed_at`` (see
+    ``projects.partitions``); its database primary key is ``(id, changed_at)``
+    while ``id`` alone stays unique through a shared sequence.
+    """
 
     project = models.ForeignKey(
         Project,
@@ -311,8 +1160,303 @@ class ProjectStatusLog(models.Model):
 
     class Meta:
         ordering = ["-changed_at"]
+        indexes = [
+            models.Index(
+                fields=["project", "-changed_at"],
+                name="projects_statuslog_project_idx",
+            ),
+            models.Index(fields=["-changed_at"], name="projects_statuslog_changed_idx"),
+        ]
         verbose_name = _("Status Log")
         verbose_name_plural = _("Status Logs")
 
     def __str__(self) -> str:
         return f"{self.project.title}: {self.old_status} → {self.new_status}"
+
+
+class CourseStats(models.Model):
+    """
+    Incrementally maintained per-course project statistics.
+
+    Rows are shifted by Project.save and the Project post_delete signal.
+    ``overdue_count`` depends on the current date, so it is only valid for
+    ``overdue_computed_on``: deltas leave it alone on stale rows, which
+    ``rebuild_course_stats --stale`` refreshes nightly and readers of it
+    refresh through ``refresh_stale`` first. The other counters do not depend
+    on the date and are kept current on every row.
+    """
+
+    course = models.OneToOneField(
+        Course,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="stats",
+    )
+    project_count = models.PositiveIntegerField(default=0)
+    draft_count = models.PositiveIntegerField(default=0)
+    in_progress_count = models.PositiveIntegerField(default=0)
+    review_count = models.PositiveIntegerField(default=0)
+    completed_count = models.PositiveIntegerField(default=0)
+    archived_count = models.PositiveIntegerField(default=0)
+    graded_count = models.PositiveIntegerField(default=0)
+    score_sum = models.PositiveBigIntegerField(default=0)
+    overdue_count = models.PositiveIntegerField(default=0)
+    overdue_computed_on = models.DateField(default=datetime.date.min)
+
+    COUNTER_FIELDS = (
+        "project_count",
+        "draft_count",
+        "in_progress_count",
+        "review_count",
+        "completed_count",
+        "archived_count",
+        "graded_count",
+        "score_sum",
+        "overdue_count",
+    )
+
+    class Meta:
+        verbose_name = _("Course Statistics")
+        verbose_name_plural = _("Course Statistics")
+
+    def __str__(self) -> str:
+        return f"Statistics for course {self.course_id}"
+
+    @property
+    def average_score(self) -> float | None:
+        """Return the average score of graded projects."""
+        if not self.graded_count:
+            return None
+        return self.score_sum / self.graded_count
+
+    @staticmethod
+    def contribution(state: ProjectState, today: datetime.date) -> Counter:
+        """Return what a single project adds to its course's counters."""
+        return Counter(
+            {
+                "project_count": 1,
+                f"{state.status}_count": 1,
+                "graded_count": int(state.score is not None),
+                "score_sum": state.score or 0,
+                "overdue_count": int(state.is_overdue(today)),
+            },
+        )
+
+    @classmethod
+    def record_changes(
+        cls,
+        changes: Iterable[tuple[ProjectState | None, ProjectState | None]],
+    ) -> None:
+        """Apply (old, new) project state pairs in one UPDATE of all courses."""
+        today = timezone.now().date()
+        deltas: dict[int, Counter] = {}
+        for old, new in changes:
+            if old is not None:
+                deltas.setdefault(old.course_id, Counter()).subtract(
+                    cls.contribution(old, today),
+                )
+            if new is not None:
+                deltas.setdefault(new.course_id, Counter()).update(
+                    cls.contribution(new, today),
+                )
+
+        shift_counters(
+            cls,
+            "course_id",
+            deltas,
+            assignments={
+                "overdue_count": "stats.overdue_count + CASE "
+                "WHEN stats.overdue_computed_on = %s THEN d.overdue_count "
+                "ELSE 0 END",
+            },
+            params=[today],
+        )
+
+    @classmethod
+    def aggregates(cls, today: datetime.date) -> dict:
+        """Return the aggregate expressions used to rebuild a course row."""
+        status_counts = {
+            f"{status}_count": Count("pk", filter=Q(status=status))
+            for status, _label in Project.STATUS_CHOICES
+        }
+        return {
+            "project_count": Count("pk"),
+            **status_counts,
+            "graded_count": Count("score"),
+            "score_sum": Coalesce(Sum("score"), 0),
+            "overdue_count": Count("pk", filter=Project.overdue_condition(today)),
+        }
+
+    @classmethod
+    def rebuild(cls, course_ids: Iterable[int] | None = None) -> int:
+        """Recompute rows from the projects table; return the number of rows."""
+        today = timezone.now().date()
+        courses = Course.objects.all()
+        if course_ids is not None:
+            courses = courses.filter(pk__in=list(course_ids))
+        totals = {
+            row.pop("course"): row
+            for row in Project.objects.filter(course__in=courses)
+            .order_by()
+            .values("course")
+            .annotate(**cls.aggregates(today))
+        }
+        rows = [
+            cls(
+                course_id=course_id,
+                overdue_computed_on=today,
+                **totals.get(course_id, {}),
+            )
+            for course_id in courses.values_list("pk", flat=True)
+        ]
+        cls.objects.bulk_create(
+            rows,
+            update_conflicts=True,
+            unique_fields=["course"],
+            update_fields=[*cls.COUNTER_FIELDS, "overdue_computed_on"],
+        )
+        return len(rows)
+
+    @classmethod
+    def refresh_stale(cls, course_ids: Iterable[int] | None = None) -> int:
+        """
+        Rebuild rows that are missing or were computed on an earlier day.
+
+        The stale rows are locked before they are aggregated, so a concurrent
+        project write waits to shift them until the rebuild has committed
+        instead of having its delta overwritten by an aggregate that missed it.
+        """
+        using = router.db_for_write(cls)
+        courses = Course.objects.using(using).exclude(
+            stats__overdue_computed_on=timezone.now().date(),
+        )
+        if course_ids is not None:
+            courses = courses.filter(pk__in=list(course_ids))
+        stale = list(courses.values_list("pk", flat=True))
+        if not stale:
+            return 0
+        with transaction.atomic(using=using):
+            locked = (
+                cls.objects.using(using)
+                .select_for_update()
+                .filter(course_id__in=stale)
+                .order_by("pk")
+            )
+            list(locked.values_list("pk", flat=True))
+            return cls.rebuild(course_ids=stale)
+
+
+class StudentStats(models.Model):
+    """
+    Incrementally maintained per-student project and score summary.
+
+    Rows are shifted by Project.save and the Project post_delete signal, so
+    average scores and top-student rankings never aggregate the projects table.
+    """
+
+    student = models.OneToOneField(
+        Student,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="stats",
+    )
+    project_count = models.PositiveIntegerField(default=0)
+    active_count = models.PositiveIntegerField(default=0)
+    completed_count = models.PositiveIntegerField(default=0)
+    graded_count = models.PositiveIntegerField(default=0)
+    score_sum = models.PositiveBigIntegerField(default=0)
+    average_score = models.FloatField(null=True, blank=True)
+
+    COUNTER_FIELDS = (
+        "project_count",
+        "active_count",
+        "completed_count",
+        "graded_count",
+        "score_sum",
+    )
+
+    class Meta:
+        verbose_name = _("Student Statistics")
+        verbose_name_plural = _("Student Statistics")
+        indexes = [
+            models.Index(
+                F("average_score").desc(),
+                name="projects_studentstats_top_idx",
+                condition=Q(graded_count__gt=0),
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"Statistics for student {self.student_id}"
+
+    @staticmethod
+    def contribution(state: ProjectState) -> Counter:
+        """Return what a single project adds to its student's counters."""
+        return Counter(
+            {
+                "project_count": 1,
+                "active_count": int(state.status == "in_progress"),
+                "completed_count": int(state.status == "completed"),
+                "graded_count": int(state.score is not None),
+                "score_sum": state.score or 0,
+            },
+        )
+
+    @classmethod
+    def record_changes(
+        cls,
+        changes: Iterable[tuple[ProjectState | None, ProjectState | None]],
+    ) -> None:
+        """Apply (old, new) project state pairs in one UPDATE of all students."""
+        deltas: dict[int, Counter] = {}
+        for old, new in changes:
+            if old is not None:
+                deltas.setdefault(old.student_id, Counter()).subtract(
+                    cls.contribution(old),
+                )
+            if new is not None:
+                deltas.setdefault(new.student_id, Counter()).update(
+                    cls.contribution(new),
+                )
+
+        shift_counters(
+            cls,
+            "student_id",
+            deltas,
+            assignments={
+                "average_score": "(stats.score_sum + d.score_sum)::float "
+                "/ NULLIF(stats.graded_count + d.graded_count, 0)",
+            },
+        )
+
+    @classmethod
+    def rebuild(cls, student_ids: Iterable[int] | None = None) -> int:
+        """Recompute rows from the projects table; return the number of rows."""
+        students = Student.objects.all()
+        if student_ids is not None:
+            students = students.filter(pk__in=list(student_ids))
+        totals = {
+            row.pop("student"): row
+            for row in Project.objects.filter(student__in=students)
+            .order_by()
+            .values("student")
+            .annotate(
+                project_count=Count("pk"),
+                active_count=Count("pk", filter=Q(status="in_progress")),
+                completed_count=Count("pk", filter=Q(status="completed")),
+                graded_count=Count("score"),
+                score_sum=Coalesce(Sum("score"), 0),
+                average_score=Avg("score"),
+            )
+        }
+        rows = [
+            cls(student_id=student_id, **totals.get(student_id, {}))
+            for student_id in students.values_list("pk", flat=True)
+        ]
+        cls.objects.bulk_create(
+            rows,
+            update_conflicts=True,
+            unique_fields=["student"],
+            update_fields=[*cls.COUNTER_FIELDS, "average_score"],
+        )
+        return len(rows)
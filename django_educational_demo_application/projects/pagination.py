@@ -0,0 +1,247 @@
+"""Keyset (cursor) and estimated-count pagination for list views."""
+
+import datetime
+import json
+from collections.abc import Sequence
+
+from django.conf import settings
+from django.core import signing
+from django.core.exceptions import ValidationError
+from django.core.paginator import EmptyPage
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db import models
+from django.db.models import F
+from django.db.models import Func
+from django.db.models import Value
+from django.db.models.lookups import GreaterThan
+from django.db.models.lookups import LessThan
+from django.http import Http404
+from django.utils.functional import cached_property
+from django.utils.translation import gettext as _
+
+CURSOR_SALT = "projects.pagination.cursor"
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that trusts PostgreSQL's row estimate for large result sets.
+
+    Unfiltered querysets use ``pg_class.reltuples`` (summed over the leaves
+    of a partitioned table) and filtered ones the row estimate of their
+    ``EXPLAIN`` plan. When the estimate reaches ``threshold``
+    (``PROJECTS_ESTIMATED_COUNT_THRESHOLD`` by default) it is used as the
+    count and ``is_estimated`` is set; smaller result sets are counted
+    exactly.
+    """
+
+    def __init__(self, *args, threshold=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if threshold is None:
+            threshold = settings.PROJECTS_ESTIMATED_COUNT_THRESHOLD
+        self.threshold = threshold
+        self.is_estimated = False
+
+    @cached_property
+    def count(self) -> int:
+        estimate = self.estimate_count()
+        if estimate is None or estimate < self.threshold:
+            return super().count
+        self.is_estimated = True
+        return estimate
+
+    def validate_number(self, number):
+        try:
+            return super().validate_number(number)
+        except EmptyPage:
+            # An estimate may be short: let pages run until rows run out.
+            if not self.is_estimated or int(number) < 1:
+                raise
+            return int(number)
+
+    def page(self, number):
+        number = self.validate_number(number)
+        if not self.is_estimated:
+            return super().page(number)
+        bottom = (number - 1) * self.per_page
+        return self._get_page(
+            self.object_list[bottom : bottom + self.per_page],
+            number,
+            self,
+        )
+
+    def estimate_count(self) -> int | None:
+        """Return the planner's row estimate, or None if there is none."""
+        queryset = self.object_list
+        if not isinstance(queryset, models.QuerySet):
+            return None
+        connection = connections[queryset.db]
+        if connection.vendor != "postgresql":
+            return None
+
+        query = queryset.query
+        with connection.cursor() as cursor:
+            if not query.where and not query.distinct and not query.is_sliced:
+                # A partitioned parent holds no rows of its own, so its
+                # estimate is the sum over the analyzed leaf partitions.
+                cursor.execute(
+                    "SELECT COALESCE("
+                    "(SELECT SUM(leaf.reltuples) FROM pg_partition_tree(%s::regclass) "
+                    "AS tree JOIN pg_class AS leaf ON leaf.oid = tree.relid "
+                    "WHERE tree.isleaf AND leaf.reltuples >= 0), "
+                    "(SELECT reltuples FROM pg_class WHERE oid = %s::regclass))",
+                    [queryset.model._meta.db_table] * 2,  # noqa: SLF001
+                )
+                row = cursor.fetchone()
+                # reltuples is -1 for tables that were never analyzed.
+                return int(row[0]) if row and row[0] >= 0 else None
+            sql, params = queryset.order_by().query.sql_with_params()
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+
+class Row(Func):
+    """SQL row constructor, compared element by element: ``ROW(a, b) < ROW(x, y)``."""
+
+    function = "ROW"
+    output_field = models.Field()
+
+
+class CursorPage(Sequence):
+    """A page of a keyset-paginated queryset with opaque neighbour tokens."""
+
+    is_cursor = True
+
+    def __init__(self, object_list, *, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __repr__(self) -> str:
+        return f"<CursorPage of {len(self)} objects>"
+
+    def __len__(self) -> int:
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    def has_previous(self) -> bool:
+        return self.previous_cursor is not None
+
+    def has_other_pages(self) -> bool:
+        return self.has_next() or self.has_previous()
+
+
+class CursorPaginationMixin:
+    """
+    Opt-in keyset pagination for ``ListView`` subclasses.
+
+    Requests with ``?paginate=cursor`` are ordered by ``cursor_ordering`` and
+    sliced with a row comparison against the last row seen, so every page
+    costs the same and no ``COUNT(*)`` is issued. All fields of
+    ``cursor_ordering`` must sort in the same direction and together be
+    unique; the default offset paginator is used otherwise.
+
+    The row comparison is also bounded by a plain comparison on the leading
+    field. For keys that span a join, such as ``("user__username", "id")``,
+    no composite index can serve the row comparison, but the bound lets
+    the index of the leading column start the scan at the cursor.
+    """
+
+    cursor_ordering: tuple[str, ...] = ()
+
+    def uses_cursor_pagination(self) -> bool:
+        return self.request.GET.get("paginate") == "cursor"
+
+    def paginate_queryset(self, queryset, page_size):
+        if not self.uses_cursor_pagination():
+            return super().paginate_queryset(queryset, page_size)
+
+        descending = self.cursor_ordering[0].startswith("-")
+        fields = [field.lstrip("-") for field in self.cursor_ordering]
+        token = self.request.GET.get("cursor")
+        backwards = False
+        if token:
+            backwards, values = self.decode_cursor(token, queryset.model, fields)
+            row = Row(*(F(field) for field in fields))
+            boundary = Row(*values)
+            before = descending != backwards
+            after = LessThan if before else GreaterThan
+            bound = "lte" if before else "gte"
+            queryset = queryset.filter(
+                after(row, boundary),
+                **{f"{fields[0]}__{bound}": values[0]},
+            )
+
+        ordering = self.cursor_ordering
+        if backwards:
+            ordering = [
+                field[1:] if field.startswith("-") else f"-{field}"
+                for field in ordering
+            ]
+        rows = list(queryset.order_by(*ordering)[: page_size + 1])
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        if backwards:
+            rows.reverse()
+
+        next_cursor = previous_cursor = None
+        if rows and (has_more or backwards):
+            next_cursor = self.encode_cursor(rows[-1], fields, backwards=False)
+        if rows and (has_more if backwards else token):
+            previous_cursor = self.encode_cursor(rows[0], fields, backwards=True)
+        page = CursorPage(
+            rows,
+            next_cursor=next_cursor,
+            previous_cursor=previous_cursor,
+        )
+        return None, page, page.object_list, page.has_other_pages()
+
+    def encode_cursor(self, obj, fields, *, backwards) -> str:
+        """Return a signed token pointing just past ``obj``."""
+        values = []
+        for field in fields:
+            value = obj
+            for part in field.split("__"):
+                value = getattr(value, part)
+            if isinstance(value, datetime.date):
+                value = value.isoformat()
+            values.append(value)
+        return signing.dumps({"b": backwards, "v": values}, salt=CURSOR_SALT)
+
+    def decode_cursor(self, token, model, fields):
+        """Return ``(backwards, values)`` for a token, typed for ``fields``."""
+        try:
+            data = signing.loads(token, salt=CURSOR_SALT)
+            values = [
+                Value(field.to_python(value), output_field=field)
+                for field, value in zip(
+                    (self.resolve_field(model, name) for name in fields),
+                    data["v"],
+                    strict=True,
+                )
+            ]
+        except (
+            signing.BadSignature,
+            KeyError,
+            TypeError,
+            ValueError,
+            ValidationError,
+        ) as exc:
+            raise Http404(_("Invalid cursor.")) from exc
+        return bool(data.get("b")), values
+
+    @staticmethod
+    def resolve_field(model, name):
+        """Return the model field addressed by a ``__``-separated path."""
+        *relations, attname = name.split("__")
+        for relation in relations:
+            model = model._meta.get_field(relation).related_model  # noqa: SLF001
+        return model._meta.get_field(attname)  # noqa: SLF001
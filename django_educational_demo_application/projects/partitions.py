@@ -0,0 +1,151 @@
+"""Monthly range partitions of the project status log."""
+
+import datetime
+import gzip
+import re
+from pathlib import Path
+
+from django.db import transaction
+from django.utils import timezone
+
+from .models import ProjectStatusLog
+
+PARENT_TABLE = ProjectStatusLog._meta.db_table  # noqa: SLF001
+DEFAULT_PARTITION = f"{PARENT_TABLE}_default"
+PARTITION_NAME = re.compile(rf"^{PARENT_TABLE}_p(\d{{4}})_(\d{{2}})$")
+
+
+def month_start(value: datetime.date) -> datetime.date:
+    """Return the first day of the month containing ``value``."""
+    return value.replace(day=1)
+
+
+def add_months(month: datetime.date, count: int) -> datetime.date:
+    """Return the first day of the month ``count`` months after ``month``."""
+    index = month.year * 12 + month.month - 1 + count
+    return datetime.date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: datetime.date) -> str:
+    return f"{PARENT_TABLE}_p{month:%Y_%m}"
+
+
+def month_bounds(month: datetime.date) -> tuple[datetime.datetime, datetime.datetime]:
+    """Return the UTC ``[start, end)`` range covered by a month's partition."""
+    start = datetime.datetime.combine(month, datetime.time(), tzinfo=datetime.UTC)
+    end = datetime.datetime.combine(
+        add_months(month, 1),
+        datetime.time(),
+        tzinfo=datetime.UTC,
+    )
+    return start, end
+
+
+def list_partitions(connection) -> dict[datetime.date, str]:
+    """Return the attached monthly partitions keyed by month, oldest first."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class AS child ON child.oid = pg_inherits.inhrelid "
+            "WHERE pg_inherits.inhparent = %s::regclass",
+            [PARENT_TABLE],
+        )
+        names = [name for (name,) in cursor.fetchall()]
+    months = {}
+    for name in names:
+        match = PARTITION_NAME.match(name)
+        if match:
+            months[datetime.date(int(match[1]), int(match[2]), 1)] = name
+    return dict(sorted(months.items()))
+
+
+def create_partition(connection, month: datetime.date) -> bool:
+    """
+    Create the partition for ``month``; return False if it already exists.
+
+    Rows that landed in the default partition because their month had no
+    partition yet are moved into the new one.
+    """
+    if month in list_partitions(connection):
+        return False
+    quote = connection.ops.quote_name
+    parent, default = quote(PARENT_TABLE), quote(DEFAULT_PARTITION)
+    start, end = month_bounds(month)
+    with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT EXISTS (SELECT 1 FROM {default} "  # noqa: S608
+            "WHERE changed_at >= %s AND changed_at < %s)",
+            [start, end],
+        )
+        (stray_rows,) = cursor.fetchone()
+        if stray_rows:
+            # A default partition may not hold rows of a new partition's
+            # range, so it is detached while they are moved across.
+            cursor.execute(f"ALTER TABLE {parent} DETACH PARTITION {default}")
+        cursor.execute(
+            f"CREATE TABLE {quote(partition_name(month))} PARTITION OF {parent} "
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')",
+        )
+        if stray_rows:
+            cursor.execute(
+                f"WITH moved AS (DELETE FROM {default} "  # noqa: S608
+                "WHERE changed_at >= %s AND changed_at < %s RETURNING *) "
+                f"INSERT INTO {parent} SELECT * FROM moved",
+                [start, end],
+            )
+            cursor.execute(f"ALTER TABLE {parent} ATTACH PARTITION {default} DEFAULT")
+    return True
+
+
+def ensure_partitions(connection, *, months_ahead: int = 3, today=None) -> list[str]:
+    """Create partitions from the current month ``months_ahead`` months ahead."""
+    current = month_start(today or timezone.now().date())
+    return [
+        partition_name(month)
+        for month in (add_months(current, offset) for offset in range(months_ahead + 1))
+        if create_partition(connection, month)
+    ]
+
+
+def expired_partitions(connection, *, retain_months: int, today=None) -> list[str]:
+    """Return partitions whose whole month is older than ``retain_months``."""
+    cutoff = add_months(month_start(today or timezone.now().date()), -retain_months)
+    return [
+        name for month, name in list_partitions(connection).items() if month < cutoff
+    ]
+
+
+def detach_partition(connection, name: str) -> None:
+    """Detach a partition, leaving it as a standalone table."""
+    quote = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"ALTER TABLE {quote(PARENT_TABLE)} DETACH PARTITION {quote(name)}",
+        )
+
+
+def archive_partition(connection, name: str, directory: Path) -> Path:
+    """
+    Copy a partition to ``<directory>/<name>.csv.gz`` and drop it.
+
+    The file is written completely before the partition is detached and
+    dropped, so a failed export leaves the data in place.
+    """
+    quote = connection.ops.quote_name
+    path = directory / f"{name}.csv.gz"
+    statement = f"COPY {quote(name)} TO STDOUT (FORMAT csv, HEADER)"
+    with (
+        connection.cursor() as cursor,
+        cursor.copy(statement) as copy,
+        gzip.open(path, "wb") as archive,
+    ):
+        for data in copy:
+            archive.write(data)
+    with transaction.atomic(using=connection.alias):
+        detach_partition(connection, name)
+        with connection.cursor() as cursor:
+            # Deferred foreign key checks of rows written earlier in an outer
+            # transaction would otherwise block the DROP.
+            cursor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+            cursor.execute(f"DROP TABLE {quote(name)}")
+    return path
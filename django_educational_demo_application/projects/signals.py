@@ -0,0 +1,131 @@
+"""Signals keeping denormalized project data in sync."""
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import models
+from django.db.models import signals
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .cache import bump_task_progress
+from .cache import bump_versions
+from .models import Course
+from .models import CourseStats
+from .models import Enrollment
+from .models import Project
+from .models import Student
+from .models import StudentStats
+from .models import Task
+
+
+def deleted_directly(origin, model: type[models.Model]) -> bool:
+    """
+    Return True if a delete was issued against ``model`` itself.
+
+    Cascaded deletes (e.g. tasks removed together with their project) have the
+    parent as origin, and there is nothing left to keep in sync for them.
+    """
+    if isinstance(origin, models.Model):
+        return isinstance(origin, model)
+    return getattr(origin, "model", None) is model
+
+
+@receiver(signals.post_delete, sender=Task)
+def decrement_project_task_counters(sender, instance, origin=None, **kwargs) -> None:
+    """Remove a deleted task from its project's task counters."""
+    if not deleted_directly(origin, Task):
+        return
+    project_id, is_completed = instance.persisted_state or (
+        instance.project_id,
+        instance.is_completed,
+    )
+    Project.objects.filter(pk=project_id).shift_task_counters(
+        total=-1,
+        completed=-int(is_completed),
+    )
+
+
+@receiver(signals.post_save, sender=Course)
+def create_course_stats(sender, instance, created, **kwargs) -> None:
+    """Create an empty statistics row for every new course."""
+    if created:
+        # Assign by id so the empty row is not cached on the instance.
+        CourseStats.objects.create(
+            course_id=instance.pk,
+            overdue_computed_on=timezone.now().date(),
+        )
+
+
+@receiver(signals.post_save, sender=Student)
+def create_student_stats(sender, instance, created, **kwargs) -> None:
+    """Create an empty statistics row for every new student."""
+    if created:
+        # Assign by id so the empty row is not cached on the instance.
+        StudentStats.objects.create(student_id=instance.pk)
+
+
+@receiver(signals.post_save, sender=settings.AUTH_USER_MODEL)
+def refresh_student_search_key(
+    sender,
+    instance,
+    created,
+    update_fields=None,
+    **kwargs,
+) -> None:
+    """Keep the student search key in sync with a renamed user."""
+    if created or (update_fields is not None and "username" not in update_fields):
+        return
+    for student in Student.objects.filter(user_id=instance.pk):
+        student.user = instance
+        student.save(update_fields=["search_key"])
+
+
+@receiver(signals.post_delete, sender=Project)
+def remove_project_from_stats(
+    sender,
+    instance,
+    origin=None,
+    **kwargs,
+) -> None:
+    """Subtract a deleted project from its course and student statistics."""
+    change = (instance.persisted_state or instance.state, None)
+    if not deleted_directly(origin, Course):
+        CourseStats.record_changes([change])
+    if not (
+        deleted_directly(origin, Student) or deleted_directly(origin, get_user_model())
+    ):
+        StudentStats.record_changes([change])
+
+
+@receiver([signals.post_save, signals.post_delete], sender=Course)
+def invalidate_course_cache(sender, instance, **kwargs) -> None:
+    """Drop cached dashboard and statistics of a changed course."""
+    bump_versions(course_ids=[instance.pk])
+
+
+@receiver([signals.post_save, signals.post_delete], sender=Project)
+@receiver([signals.post_save, signals.post_delete], sender=Enrollment)
+def invalidate_project_course_cache(sender, instance, **kwargs) -> None:
+    """Drop cached dashboard and statistics of the project's course."""
+    bump_versions(course_ids=[instance.course_id])
+
+
+@receiver(signals.pre_save, sender=Project)
+def invalidate_previous_course_cache(sender, instance, **kwargs) -> None:
+    """Drop cached statistics of the course a project is moved away from."""
+    old = instance.persisted_state
+    if old is not None and old.course_id != instance.course_id:
+        bump_versions(course_ids=[old.course_id])
+
+
+@receiver([signals.post_save, signals.post_delete], sender=Task)
+def invalidate_task_progress_cache(sender, instance, origin=None, **kwargs) -> None:
+    """Drop the cached dashboard if it shows the progress of the task's project."""
+    if origin is None or deleted_directly(origin, Task):
+        bump_task_progress([instance.project_id])
+
+
+@receiver(signals.post_save, sender=Student)
+def invalidate_dashboard_cache(sender, instance, **kwargs) -> None:
+    """Drop the cached dashboard, which lists top students."""
+    bump_versions()
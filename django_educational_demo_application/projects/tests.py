@@ -1,13 +1,39 @@
 """Tests for educational project management models."""
 
+import contextlib
+import csv
+import datetime
+import gzip
+import io
+import json
+from unittest import mock
+
 import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import DEFAULT_DB_ALIAS
+from django.db import connection
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
 from django.utils import timezone
+from prometheus_client import REGISTRY
 
+from config import routers
+from config.routers import ReplicaRouter
+from django_educational_demo_application.projects import partitions
 from django_educational_demo_application.projects.models import Course
+from django_educational_demo_application.projects.models import CourseStats
 from django_educational_demo_application.projects.models import Enrollment
 from django_educational_demo_application.projects.models import Project
 from django_educational_demo_application.projects.models import ProjectStatusLog
+from django_educational_demo_application.projects.models import Student
+from django_educational_demo_application.projects.models import StudentStats
 from django_educational_demo_application.projects.models import Task
+from django_educational_demo_application.projects.pagination import (
+    EstimatedCountPaginator,
+)
+from django_educational_demo_application.projects.urls import urlpatterns
 from django_educational_demo_application.users.tests.factories import UserFactory
 
 
@@ -48,6 +74,11 @@ def project(db, course, student):
     )
 
 
+def metric(name: str, **labels) -> float:
+    """Return the current value of a Prometheus sample, 0 if never set."""
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
 class TestCourseModel:
     """Test Course model."""
 
@@ -81,6 +112,27 @@ class TestCourseModel:
     def test_get_absolute_url(self, course):
         assert course.get_absolute_url() == f"/courses/{course.pk}/"
 
+    def test_status_in_sql(self, client, course, student):
+        today = timezone.now().date()
+        Course.objects.create(
+            name="Future Course",
+            code="FC101",
+            start_date=today + timezone.timedelta(days=30),
+            end_date=today + timezone.timedelta(days=90),
+        )
+        statuses = dict(
+            Course.objects.with_status().values_list("code", "current_status"),
+        )
+        assert statuses == {"TC101": "active", "FC101": "upcoming"}
+        assert list(
+            Course.objects.filter_status("upcoming").values_list("code", flat=True),
+        ) == ["FC101"]
+        assert not Course.objects.filter_status("completed").exists()
+
+        client.force_login(student.user)
+        response = client.get(reverse("projects:course_list"), {"status": "active"})
+        assert [c.code for c in response.context["courses"]] == ["TC101"]
+
 
 class TestStudentModel:
     """Test Student model."""
@@ -113,6 +165,12 @@ class TestStudentModel:
     def test_get_average_score_no_projects(self, student):
         assert student.get_average_score() is None
 
+    def test_get_average_score_without_stats_row(self, student):
+        StudentStats.objects.filter(student=student).delete()
+        student = Student.objects.get(pk=student.pk)
+        assert student.get_average_score() is None
+        assert not StudentStats.objects.filter(student=student).exists()
+
 
 class TestProjectModel:
     """Test Project model."""
@@ -145,6 +203,38 @@ class TestProjectModel:
         )
         assert project.is_overdue is False
 
+    def test_overdue_queryset(self, course, student):
+        yesterday = timezone.now().date() - timezone.timedelta(days=1)
+        for title, status, deadline in [
+            ("Late", "review", yesterday),
+            ("Done", "completed", yesterday),
+            ("Open", "draft", None),
+        ]:
+            Project.objects.create(
+                title=title,
+                course=course,
+                student=student,
+                status=status,
+                deadline=deadline,
+            )
+
+        assert list(Project.objects.overdue().values_list("title", flat=True)) == [
+            "Late",
+        ]
+        annotated = {p.title: p.is_overdue for p in Project.objects.with_overdue()}
+        assert annotated == {"Late": True, "Done": False, "Open": False}
+
+    def test_overdue_uses_partial_index(self, db):
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            # Without the default ordering, which the keyset index can serve
+            # about as cheaply on a near-empty table.
+            overdue = Project.objects.overdue().order_by()
+            sql, params = overdue.query.sql_with_params()
+            cursor.execute(f"EXPLAIN {sql}", params)
+            plan = "\n".join(row[0] for row in cursor.fetchall())
+        assert "projects_project_open_dl_idx" in plan
+
     def test_days_until_deadline(self, db, course, student):
         project = Project.objects.create(
             title="Future Project",
@@ -167,6 +257,33 @@ class TestProjectModel:
         assert project.status == "in_progress"
         assert ProjectStatusLog.objects.count() == 1
 
+    def test_transition_logs_previous_status(self, project):
+        project.transition_to("in_progress", comment="Started")
+        log = ProjectStatusLog.objects.get(project=project)
+        assert (log.old_status, log.new_status) == ("draft", "in_progress")
+        assert log.comment == "Started"
+
+    def test_transition_to_loses_to_concurrent_change(self, project):
+        stale = Project.objects.get(pk=project.pk)
+        assert project.transition_to("in_progress")
+        assert stale.transition_to("archived") is False
+        project.refresh_from_db()
+        assert project.status == "in_progress"
+        assert ProjectStatusLog.objects.filter(project=project).count() == 1
+
+    def test_transition_counted_on_commit(
+        self,
+        project,
+        django_capture_on_commit_callbacks,
+    ):
+        labels = {"old_status": "draft", "new_status": "in_progress"}
+        before = metric("lms_project_transitions_total", **labels)
+        with django_capture_on_commit_callbacks(execute=True) as callbacks:
+            project.transition_to("in_progress")
+            assert metric("lms_project_transitions_total", **labels) == before
+        assert callbacks
+        assert metric("lms_project_transitions_total", **labels) == before + 1
+
     def test_transition_to_invalid(self, project):
         result = project.transition_to("completed")
         assert result is False
@@ -182,6 +299,947 @@ class TestProjectModel:
         assert project.progress_percentage == 66  # noqa: PLR2004
 
 
+class TestProjectStatusTransitionView:
+    """Test the single project transition endpoint."""
+
+    def url(self, project):
+        return reverse("projects:project_transition", args=[project.pk])
+
+    def test_transition_query_count(
+        self,
+        client,
+        project,
+        django_assert_num_queries,
+    ):
+        client.force_login(project.student.user)
+        # Session and user, the savepoint pair of ATOMIC_REQUESTS, the project
+        # and the transition statement.
+        with django_assert_num_queries(6):
+            response = client.post(self.url(project), {"new_status": "in_progress"})
+        assert response.json() == {"success": True, "status": "in_progress"}
+
+    def test_lost_race_returns_conflict(self, client, project):
+        client.force_login(project.student.user)
+        stale = Project.objects.get(pk=project.pk)
+        project.transition_to("in_progress")
+        # Hand the view the instance it would have loaded before the race.
+        with mock.patch(
+            "django_educational_demo_application.projects.views.get_object_or_404",
+            return_value=stale,
+        ):
+            response = client.post(self.url(project), {"new_status": "archived"})
+        assert response.status_code == 409  # noqa: PLR2004
+        project.refresh_from_db()
+        assert project.status == "in_progress"
+
+
+class TestBulkTransition:
+    """Test moving many projects between statuses at once."""
+
+    @pytest.fixture
+    def projects(self, course, student):
+        return [
+            Project.objects.create(
+                title=f"P{number}",
+                course=course,
+                student=student,
+                status=status,
+            )
+            for number, status in enumerate(["review", "review", "draft", "completed"])
+        ]
+
+    def test_moves_only_allowed_projects(self, projects, course, student):
+        user = UserFactory()
+        moved = Project.objects.all().bulk_transition(
+            "completed",
+            user=user,
+            comment="Semester end",
+        )
+        assert sorted(moved) == [projects[0].pk, projects[1].pk]
+
+        statuses = dict(Project.objects.values_list("pk", "status"))
+        assert statuses[projects[2].pk] == "draft"
+        completed = Project.objects.get(pk=projects[0].pk)
+        assert (completed.score, completed.completed_at is not None) == (0, True)
+
+        logs = ProjectStatusLog.objects.filter(changed_by=user)
+        assert {(log.old_status, log.new_status, log.comment) for log in logs} == {
+            ("review", "completed", "Semester end"),
+        }
+        assert logs.count() == 2  # noqa: PLR2004
+        assert CourseStats.objects.get(course=course).completed_count == 3  # noqa: PLR2004
+        stats = StudentStats.objects.get(student=student)
+        assert (stats.completed_count, stats.graded_count) == (3, 2)
+
+    def test_one_update_per_source_status(
+        self,
+        projects,
+        django_assert_num_queries,
+    ):
+        # Rows, one UPDATE per source status, course and student statistics
+        # and the log insert.
+        with django_assert_num_queries(6):
+            moved = Project.objects.all().bulk_transition("archived")
+        assert len(moved) == 2  # noqa: PLR2004
+
+    def test_statistics_writes_do_not_grow_with_rows(
+        self,
+        course,
+        django_assert_num_queries,
+    ):
+        students = [
+            UserFactory(username=f"bulk{number}").student_profile for number in range(3)
+        ]
+        courses = [course] + [
+            Course.objects.create(
+                name=f"Course {number}",
+                code=f"BT{number}",
+                start_date=course.start_date,
+                end_date=course.end_date,
+            )
+            for number in range(2)
+        ]
+        for number, (other, student) in enumerate(
+            zip(courses, students, strict=True),
+        ):
+            Project.objects.create(
+                title=f"P{number}",
+                course=other,
+                student=student,
+                status="review",
+                score=10 * (number + 1),
+            )
+
+        with django_assert_num_queries(5):
+            moved = Project.objects.all().bulk_transition("completed")
+        assert len(moved) == 3  # noqa: PLR2004
+
+        for number, (other, student) in enumerate(
+            zip(courses, students, strict=True),
+        ):
+            course_stats = CourseStats.objects.get(course=other)
+            assert (course_stats.review_count, course_stats.completed_count) == (0, 1)
+            stats = StudentStats.objects.get(student=student)
+            assert stats.completed_count == 1
+            assert stats.average_score == 10 * (number + 1)
+
+    def test_counts_transitions_by_old_status(
+        self,
+        projects,
+        django_capture_on_commit_callbacks,
+    ):
+        statuses = ("review", "draft")
+        before = [
+            metric(
+                "lms_project_transitions_total",
+                old_status=old,
+                new_status="in_progress",
+            )
+            for old in statuses
+        ]
+        with django_capture_on_commit_callbacks(execute=True):
+            Project.objects.all().bulk_transition("in_progress")
+        after = [
+            metric(
+                "lms_project_transitions_total",
+                old_status=old,
+                new_status="in_progress",
+            )
+            for old in statuses
+        ]
+        assert [new - old for old, new in zip(before, after, strict=True)] == [2, 1]
+
+    def test_endpoint(self, client, projects, student):
+        client.force_login(student.user)
+        ids = [project.pk for project in projects]
+        response = client.post(
+            reverse("projects:project_bulk_transition"),
+            {"project_ids": ids, "new_status": "in_progress"},
+            content_type="application/json",
+        )
+        assert response.json() == {
+            "success": True,
+            "status": "in_progress",
+            "transitioned": ids,
+            "skipped": [],
+        }
+
+
+class TestImportRoster:
+    """Test the bulk roster import command."""
+
+    def test_creates_users_students_and_enrollments(self, tmp_path, course, student):
+        roster = tmp_path / "roster.csv"
+        roster.write_text(
+            "username,email,name,group,course_code\n"
+            "alice,alice@example.com,Alice,CS-101,TC101\n"
+            "bob,,Bob,CS-102,TC101\n"
+            "bob,,Bob,CS-102,UNKNOWN\n"
+            f"{student.user.username},,,,TC101\n",
+            encoding="utf-8",
+        )
+        out = io.StringIO()
+        for _ in range(2):
+            call_command(
+                "import_roster",
+                roster,
+                chunk_size=2,
+                stdout=out,
+                stderr=io.StringIO(),
+            )
+        assert "rows/s" in out.getvalue()
+
+        alice = Student.objects.select_related("user").get(user__username="alice")
+        assert alice.student_id == f"STU{alice.user_id:05d}"
+        assert alice.search_key.startswith("alice stu")
+        assert not alice.user.has_usable_password()
+        assert StudentStats.objects.filter(student=alice).exists()
+        assert set(
+            Enrollment.objects.filter(course=course).values_list(
+                "student__user__username",
+                flat=True,
+            ),
+        ) == {"alice", "bob", student.user.username}
+        assert Student.objects.get(pk=student.pk).student_id == "STU001"
+
+
+class TestStatusLogPartitions:
+    """Test the monthly partitions of the status log."""
+
+    def partition_of(self, log):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT tableoid::regclass::text FROM projects_projectstatuslog "
+                "WHERE id = %s",
+                [log.pk],
+            )
+            return cursor.fetchone()[0]
+
+    def log_at(self, project, changed_at):
+        log = ProjectStatusLog.objects.create(
+            project=project,
+            old_status="draft",
+            new_status="in_progress",
+        )
+        # Updating the partition key moves the row between partitions.
+        ProjectStatusLog.objects.filter(pk=log.pk).update(changed_at=changed_at)
+        return log
+
+    def test_logs_land_in_the_current_month(self, project):
+        log = ProjectStatusLog.objects.create(
+            project=project,
+            old_status="draft",
+            new_status="in_progress",
+        )
+        month = partitions.month_start(timezone.now().date())
+        assert self.partition_of(log) == partitions.partition_name(month)
+
+    def test_new_partition_adopts_rows_from_default(self, project):
+        log = self.log_at(project, datetime.datetime(2100, 1, 15, tzinfo=datetime.UTC))
+        assert self.partition_of(log) == partitions.DEFAULT_PARTITION
+
+        assert partitions.create_partition(connection, datetime.date(2100, 1, 1))
+        assert self.partition_of(log) == "projects_projectstatuslog_p2100_01"
+        assert not partitions.create_partition(connection, datetime.date(2100, 1, 1))
+
+    def test_command_archives_expired_partitions(self, project, tmp_path):
+        partitions.create_partition(connection, datetime.date(2000, 1, 1))
+        log = self.log_at(project, datetime.datetime(2000, 1, 10, tzinfo=datetime.UTC))
+
+        call_command(
+            "status_log_partitions",
+            retain_months=1,
+            archive_dir=tmp_path,
+            stdout=io.StringIO(),
+        )
+
+        archive = tmp_path / "projects_projectstatuslog_p2000_01.csv.gz"
+        with gzip.open(archive, "rt") as rows:
+            assert [row["id"] for row in csv.DictReader(rows)] == [str(log.pk)]
+        assert datetime.date(2000, 1, 1) not in partitions.list_partitions(connection)
+        assert not ProjectStatusLog.objects.filter(pk=log.pk).exists()
+
+    def test_estimated_count_sums_partitions(self, project):
+        for _ in range(3):
+            ProjectStatusLog.objects.create(
+                project=project,
+                old_status="draft",
+                new_status="in_progress",
+            )
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE projects_projectstatuslog")
+        paginator = EstimatedCountPaginator(ProjectStatusLog.objects.all(), 10)
+        assert paginator.estimate_count() == 3  # noqa: PLR2004
+
+
+class TestProjectSearch:
+    """Test full-text and trigram project search."""
+
+    @pytest.fixture
+    def projects(self, course, student):
+        titles = {
+            "Kubernetes deployment": "Deploying services to a cluster",
+            "Веб-приложение": "Разработка проектов на Django",  # noqa: RUF001
+            "Data pipeline": "Batch processing",
+        }
+        return [
+            Project.objects.create(
+                title=title,
+                description=description,
+                course=course,
+                student=student,
+            )
+            for title, description in titles.items()
+        ]
+
+    def titles(self, text, queryset=None):
+        queryset = Project.objects.all() if queryset is None else queryset
+        return [project.title for project in queryset.search(text)]
+
+    def test_english_stemming(self, projects):
+        assert self.titles("deploy") == ["Kubernetes deployment"]
+
+    def test_russian_stemming(self, projects):
+        assert self.titles("проект") == ["Веб-приложение"]  # noqa: RUF001
+
+    def test_trigram_typo(self, projects):
+        assert self.titles("Kubernetis") == ["Kubernetes deployment"]
+
+    def test_combines_with_filters(self, projects):
+        projects[0].transition_to("in_progress")
+        drafts = Project.objects.filter(status="draft")
+        assert self.titles("deploy", drafts) == []
+
+
+class TestStudentSearch:
+    """Test the precomputed student search key."""
+
+    def ids(self, text):
+        return [student.student_id for student in Student.objects.search(text)]
+
+    def test_search_key(self, student):
+        username = student.user.username.lower()
+        assert student.search_key == f"{username} stu001 group a"
+
+    def test_matches_username_group_and_id(self, student):
+        assert self.ids(student.user.username.upper()[1:]) == ["STU001"]
+        assert self.ids("group a") == ["STU001"]
+        assert self.ids("u00") == ["STU001"]
+        assert self.ids("group b") == []
+
+    def test_student_id_prefix(self, student):
+        assert self.ids("stu00") == ["STU001"]
+        assert self.ids("STU002") == []
+
+    def test_follows_username_change(self, student):
+        user = student.user
+        user.username = "renamed"
+        user.save()
+        student.refresh_from_db()
+        assert student.search_key == "renamed stu001 group a"
+
+
+class TestTaskBulkCreateView:
+    """Test creating many tasks in one request."""
+
+    def url(self, project):
+        return reverse("projects:task_bulk_create", kwargs={"project_pk": project.pk})
+
+    def test_json_array(self, client, project, student, django_assert_num_queries):
+        client.force_login(student.user)
+        Task.objects.create(title="Existing", project=project, order=Task.ORDER_GAP)
+        titles = [f"Step {number}" for number in range(30)]
+        # Session and user, the savepoint pair of ATOMIC_REQUESTS, the locked
+        # project, one INSERT and one counter UPDATE.
+        with django_assert_num_queries(7):
+            response = client.post(
+                self.url(project),
+                titles,
+                content_type="application/json",
+            )
+        assert response.status_code == 201  # noqa: PLR2004
+        task_ids = response.json()["task_ids"]
+        tasks = Task.objects.filter(pk__in=task_ids).order_by("order")
+        assert [task.title for task in tasks] == titles
+        assert [task.order for task in tasks] == [
+            position * Task.ORDER_GAP for position in range(2, 32)
+        ]
+        project.refresh_from_db()
+        assert project.task_count == 31  # noqa: PLR2004
+
+    def test_orders_continue_after_the_last_task(self, client, project, student):
+        client.force_login(student.user)
+        Task.objects.create(title="Moved", project=project, order=10 * Task.ORDER_GAP)
+        response = client.post(
+            self.url(project),
+            ["First", "Second"],
+            content_type="application/json",
+        )
+        orders = Task.objects.filter(pk__in=response.json()["task_ids"]).values_list(
+            "order",
+            flat=True,
+        )
+        # From the highest order, not from the task count.
+        assert sorted(orders) == [11 * Task.ORDER_GAP, 12 * Task.ORDER_GAP]
+
+    def test_form_lines(self, client, project, student):
+        client.force_login(student.user)
+        response = client.post(self.url(project), {"titles": "First\n\n  Second \n"})
+        assert response.status_code == 201  # noqa: PLR2004
+        assert list(project.tasks.values_list("title", flat=True)) == [
+            "First",
+            "Second",
+        ]
+
+    def test_rejects_invalid_payload(self, client, project, student):
+        client.force_login(student.user)
+        for payload in ({"titles": "nope"}, []):
+            response = client.post(
+                self.url(project),
+                payload,
+                content_type="application/json",
+            )
+            assert response.status_code == 400  # noqa: PLR2004
+        assert not project.tasks.exists()
+
+
+class TestTaskOrdering:
+    """Test gap-based task ordering, moves and reordering."""
+
+    @pytest.fixture
+    def tasks(self, project):
+        return Task.objects.bulk_create(
+            Task(project=project, title=title, order=position * Task.ORDER_GAP)
+            for position, title in enumerate("ABC", start=1)
+        )
+
+    def titles(self, project):
+        return list(project.tasks.values_list("title", flat=True))
+
+    def test_create_appends_after_last_task(self, client, project, tasks):
+        client.force_login(project.student.user)
+        client.post(
+            reverse("projects:task_create", kwargs={"project_pk": project.pk}),
+            {"title": "D", "order": 0},
+            headers={"X-Requested-With": "XMLHttpRequest"},
+        )
+        assert project.tasks.get(title="D").order == 4 * Task.ORDER_GAP
+
+    def test_move_writes_one_row(
+        self,
+        client,
+        project,
+        tasks,
+        django_assert_num_queries,
+    ):
+        client.force_login(project.student.user)
+        first, second, third = tasks
+        # One lookup of the following task and one UPDATE of the moved task.
+        with django_assert_num_queries(2):
+            third.move_after(first)
+        assert third.order == (first.order + second.order) // 2
+        assert self.titles(project) == ["A", "C", "B"]
+
+        response = client.post(
+            reverse("projects:task_move", args=[first.pk]),
+            {"after": third.pk},
+        )
+        assert response.json()["success"]
+        assert self.titles(project) == ["C", "A", "B"]
+
+    def test_move_renumbers_crowded_project(self, project, tasks):
+        first, second, third = tasks
+        Task.objects.filter(pk=second.pk).update(order=first.order + 1)
+        third.move_after(first)
+        assert self.titles(project) == ["A", "C", "B"]
+        orders = list(project.tasks.values_list("order", flat=True))
+        assert orders[0] == Task.ORDER_GAP
+        assert orders[2] == 2 * Task.ORDER_GAP
+
+    def test_reorder_endpoint(self, client, project, tasks):
+        client.force_login(project.student.user)
+        url = reverse("projects:task_reorder", kwargs={"project_pk": project.pk})
+        first, second, third = tasks
+
+        response = client.post(
+            url,
+            [third.pk, first.pk, second.pk],
+            content_type="application/json",
+        )
+        assert response.json() == {"success": True, "updated": 3}
+        assert self.titles(project) == ["C", "A", "B"]
+
+        response = client.post(
+            url,
+            [third.pk, first.pk],
+            content_type="application/json",
+        )
+        assert response.status_code == 400  # noqa: PLR2004
+
+    def test_renumber_command(self, project, tasks):
+        Task.objects.filter(project=project).update(order=1)
+        assert Task.objects.crowded_project_ids() == {project.pk}
+        call_command("renumber_tasks", stdout=io.StringIO())
+        assert not Task.objects.crowded_project_ids()
+        assert self.titles(project) == ["A", "B", "C"]
+
+
+class TestProjectExport:
+    """Test streaming exports of the filtered project list."""
+
+    @pytest.fixture
+    def projects(self, course, student):
+        for number, status in enumerate(["draft", "in_progress", "draft"]):
+            Project.objects.create(
+                title=f"P{number}",
+                course=course,
+                student=student,
+                status=status,
+            )
+
+    def export(self, client, student, **params):
+        client.force_login(student.user)
+        response = client.get(reverse("projects:project_list"), params)
+        assert response.streaming
+        return b"".join(response.streaming_content).decode()
+
+    def test_csv_uses_list_filters(self, client, projects, student):
+        content = self.export(client, student, export="csv", status="draft")
+        rows = list(csv.DictReader(io.StringIO(content)))
+        assert sorted(row["title"] for row in rows) == ["P0", "P2"]
+        assert rows[0]["student_id"] == "STU001"
+        assert rows[0]["course"] == "TC101"
+
+    def test_ndjson(self, client, projects, student):
+        content = self.export(client, student, export="ndjson")
+        rows = [json.loads(line) for line in content.splitlines()]
+        assert len(rows) == 3  # noqa: PLR2004
+        assert {row["status"] for row in rows} == {"draft", "in_progress"}
+
+    def test_ndjson_starts_before_the_query(
+        self,
+        client,
+        projects,
+        student,
+        django_assert_num_queries,
+    ):
+        client.force_login(student.user)
+        response = client.get(reverse("projects:project_list"), {"export": "ndjson"})
+        assert response["X-Accel-Buffering"] == "no"
+        content = iter(response.streaming_content)
+        with django_assert_num_queries(0):
+            assert next(content) == b""
+        assert len(list(content)) == 3  # noqa: PLR2004
+
+
+class TestCourseGradebook:
+    """Test the streamed per-course gradebook."""
+
+    def test_pivots_projects_per_student(self, client, course, student):
+        Enrollment.objects.create(student=student, course=course)
+        other = UserFactory(username="aaa").student_profile
+        Enrollment.objects.create(student=other, course=course)
+        today = timezone.now().date()
+        Project.objects.create(
+            title="Essay",
+            course=course,
+            student=student,
+            status="in_progress",
+            deadline=today - timezone.timedelta(days=1),
+            task_count=4,
+            completed_task_count=1,
+        )
+        Project.objects.create(
+            title="Lab",
+            course=course,
+            student=student,
+            status="completed",
+            score=90,
+        )
+
+        client.force_login(student.user)
+        response = client.get(reverse("projects:course_gradebook", args=[course.pk]))
+        content = b"".join(response.streaming_content).decode()
+        header, *rows = csv.reader(io.StringIO(content))
+
+        assert header[:7] == [
+            "student",
+            "student_id",
+            "group",
+            "Essay: status",
+            "Essay: score",
+            "Essay: progress %",
+            "Essay: deadline",
+        ]
+        assert len(header) == 11  # noqa: PLR2004
+        assert [row[0] for row in rows] == ["aaa", student.user.username]
+        assert rows[0][3:] == [""] * 8
+        assert rows[1][3:] == [
+            "in_progress",
+            "",
+            "25",
+            "overdue",
+            "completed",
+            "90",
+            "0",
+            "",
+        ]
+
+
+class TestCursorPagination:
+    """Test keyset pagination of the project and student lists."""
+
+    def test_next_and_previous_pages(self, client, course, student):
+        client.force_login(student.user)
+        Project.objects.bulk_create(
+            Project(title=f"P{number:02d}", course=course, student=student)
+            for number in range(17)
+        )
+        url = reverse("projects:project_list")
+
+        first = client.get(url, {"paginate": "cursor"}).context["page_obj"]
+        assert len(first) == 15  # noqa: PLR2004
+        assert not first.has_previous()
+
+        second = client.get(
+            url,
+            {"paginate": "cursor", "cursor": first.next_cursor},
+        ).context["page_obj"]
+        assert len(second) == 2  # noqa: PLR2004
+        assert not second.has_next()
+        assert {p.pk for p in first}.isdisjoint(p.pk for p in second)
+
+        back = client.get(
+            url,
+            {"paginate": "cursor", "cursor": second.previous_cursor},
+        ).context["page_obj"]
+        assert [p.pk for p in back] == [p.pk for p in first]
+        assert not back.has_previous()
+
+    def test_student_pages_start_at_the_cursor(self, client, student):
+        client.force_login(student.user)
+        for number in range(24):
+            UserFactory(username=f"user{number:02d}")
+        url = reverse("projects:student_list")
+
+        first = client.get(url, {"paginate": "cursor"}).context["page_obj"]
+        with CaptureQueriesContext(connection) as queries:
+            second = client.get(
+                url,
+                {"paginate": "cursor", "cursor": first.next_cursor},
+            ).context["page_obj"]
+
+        usernames = [s.user.username for s in [*first, *second]]
+        assert usernames == sorted(
+            Student.objects.values_list("user__username", flat=True),
+        )
+        # The join defeats a composite index; the leading bound uses the
+        # username index instead.
+        assert any(
+            '"users_user"."username" >= ' in query["sql"]
+            for query in queries.captured_queries
+        )
+
+    def test_invalid_cursor(self, client, student):
+        client.force_login(student.user)
+        url = reverse("projects:student_list")
+        response = client.get(url, {"paginate": "cursor", "cursor": "bogus"})
+        assert response.status_code == 404  # noqa: PLR2004
+
+
+class TestEstimatedCountPaginator:
+    """Test planner-estimated counts for large listings."""
+
+    @pytest.fixture
+    def projects(self, course, student):
+        Project.objects.bulk_create(
+            Project(title=f"P{number}", course=course, student=student)
+            for number in range(5)
+        )
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE projects_project")
+
+    def test_exact_below_threshold(self, projects):
+        paginator = EstimatedCountPaginator(Project.objects.all(), 2, threshold=100)
+        assert paginator.count == 5  # noqa: PLR2004
+        assert not paginator.is_estimated
+
+    def test_table_estimate(self, projects):
+        paginator = EstimatedCountPaginator(Project.objects.all(), 2, threshold=1)
+        assert paginator.count == 5  # noqa: PLR2004
+        assert paginator.is_estimated
+
+    def test_filtered_estimate_allows_pages_past_the_end(self, projects):
+        queryset = Project.objects.filter(status="draft")
+        paginator = EstimatedCountPaginator(queryset, 2, threshold=1)
+        assert paginator.count >= 1
+        assert paginator.is_estimated
+        assert len(paginator.page(paginator.num_pages + 1)) == 0
+
+
+class TestDashboardView:
+    """Test the dashboard query budget."""
+
+    # Session, user, stale-stats check, totals, courses, recent projects and
+    # top students; the view opts out of ATOMIC_REQUESTS.
+    QUERIES = 7
+
+    def test_query_count_is_independent_of_data(
+        self,
+        client,
+        project,
+        student,
+        django_assert_num_queries,
+    ):
+        client.force_login(student.user)
+        url = reverse("projects:dashboard")
+        with django_assert_num_queries(self.QUERIES):
+            assert client.get(url).status_code == 200  # noqa: PLR2004
+
+        for number in range(5):
+            course = Course.objects.create(
+                name=f"Course {number}",
+                code=f"C{number}",
+                start_date=timezone.now().date(),
+                end_date=timezone.now().date(),
+            )
+            other = UserFactory().student_profile
+            Project.objects.create(
+                title=f"P{number}",
+                course=course,
+                student=other,
+                status="completed",
+                score=number,
+            )
+        cache.clear()
+        with django_assert_num_queries(self.QUERIES):
+            assert client.get(url).status_code == 200  # noqa: PLR2004
+
+    def test_cached_until_a_project_changes(
+        self,
+        client,
+        project,
+        student,
+        django_assert_num_queries,
+        django_capture_on_commit_callbacks,
+    ):
+        client.force_login(student.user)
+        url = reverse("projects:dashboard")
+        client.get(url)
+        # Only the session and the user.
+        with django_assert_num_queries(2):
+            assert client.get(url).context["total_projects"] == 1
+
+        with django_capture_on_commit_callbacks(execute=True):
+            Project.objects.create(title="New", course=project.course, student=student)
+        assert client.get(url).context["total_projects"] == 2  # noqa: PLR2004
+
+    def test_task_writes_only_invalidate_shown_progress(
+        self,
+        client,
+        project,
+        student,
+        django_assert_num_queries,
+        django_capture_on_commit_callbacks,
+    ):
+        # Five newer projects push the fixture's project off the dashboard.
+        shown = [
+            Project.objects.create(
+                title=f"P{number}",
+                course=project.course,
+                student=student,
+            )
+            for number in range(5)
+        ]
+        client.force_login(student.user)
+        url = reverse("projects:dashboard")
+        client.get(url)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            hidden = Task.objects.create(title="Hidden", project=project)
+            Task.objects.toggle_completion(hidden.pk)
+            Task.objects.bulk_create([Task(title="Bulk", project=project)])
+            Task.objects.filter(pk=hidden.pk).update(is_completed=False)
+        with django_assert_num_queries(2):
+            client.get(url)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            Task.objects.create(title="Shown", project=shown[0], is_completed=True)
+        context = client.get(url).context
+        progress = {p.pk: p.progress_percentage for p in context["recent_projects"]}
+        assert progress[shown[0].pk] == 100  # noqa: PLR2004
+
+    def test_counts_cache_lookups(self, client, student):
+        client.force_login(student.user)
+        url = reverse("projects:dashboard")
+        results = ("hit", "miss")
+        before = [
+            metric("lms_cache_lookups_total", cache="dashboard", result=result)
+            for result in results
+        ]
+        client.get(url)
+        client.get(url)
+        after = [
+            metric("lms_cache_lookups_total", cache="dashboard", result=result)
+            for result in results
+        ]
+        assert [new - old for old, new in zip(before, after, strict=True)] == [1, 1]
+
+
+class TestCourseDetailView:
+    """Test caching of the course statistics block."""
+
+    def test_stats_follow_project_changes(
+        self,
+        client,
+        project,
+        student,
+        django_capture_on_commit_callbacks,
+    ):
+        client.force_login(student.user)
+        url = project.course.get_absolute_url()
+        assert client.get(url).context["stats"]["total_projects"] == 1
+
+        with django_capture_on_commit_callbacks(execute=True):
+            project.delete()
+        assert client.get(url).context["stats"]["total_projects"] == 0
+
+
+class TestRequestTransactions:
+    """Test which views run inside an ATOMIC_REQUESTS transaction."""
+
+    NON_ATOMIC = {
+        "dashboard",
+        "course_list",
+        "course_detail",
+        "course_gradebook",
+        "student_list",
+        "student_detail",
+        "project_list",
+        "project_detail",
+        "task_update",
+    }
+
+    def test_only_read_views_opt_out(self):
+        for pattern in urlpatterns:
+            opted_out = getattr(pattern.callback, "_non_atomic_requests", set())
+            assert (DEFAULT_DB_ALIAS in opted_out) == (
+                pattern.name in self.NON_ATOMIC
+            ), pattern.name
+
+    def test_read_view_opens_no_transaction(self, client, project):
+        client.force_login(project.student.user)
+        with CaptureQueriesContext(connection) as queries:
+            client.get(project.course.get_absolute_url())
+        assert not [query for query in queries if "SAVEPOINT" in query["sql"]]
+
+        with CaptureQueriesContext(connection) as queries:
+            client.post(
+                reverse("projects:project_transition", args=[project.pk]),
+                {"new_status": "in_progress"},
+            )
+        assert [query for query in queries if "SAVEPOINT" in query["sql"]]
+
+
+@pytest.mark.django_db(databases=["default", "replica"])
+class TestReplicaRouting:
+    """Test routing reads to the (mirrored) read replica."""
+
+    @pytest.fixture(autouse=True)
+    def replica(self, settings):
+        settings.REPLICA_DATABASE = "replica"
+        settings.REPLICA_LAG_CHECK_INTERVAL = 0
+
+    def replica_reads(self, client, url) -> list[str]:
+        with CaptureQueriesContext(connections["replica"]) as queries:
+            assert client.get(url).status_code == 200  # noqa: PLR2004
+        return [query["sql"] for query in queries if "projects_" in query["sql"]]
+
+    def test_list_reads_from_replica(self, client, project):
+        client.force_login(project.student.user)
+        assert self.replica_reads(client, reverse("projects:project_list"))
+
+    @contextlib.contextmanager
+    def routed_to_replica(self):
+        """Route reads to the replica and fail on any project query sent to it."""
+        token = routers.replica_reads.set(True)
+        try:
+            with CaptureQueriesContext(connections["replica"]) as queries:
+                yield
+        finally:
+            routers.replica_reads.reset(token)
+        assert [query["sql"] for query in queries if "projects_" in query["sql"]] == []
+
+    def test_export_streams_from_replica(self, client, project):
+        client.force_login(project.student.user)
+        url = reverse("projects:project_list") + "?export=ndjson"
+        with CaptureQueriesContext(connections["replica"]) as queries:
+            response = client.get(url)
+            b"".join(response.streaming_content)
+        assert [query for query in queries if "projects_project" in query["sql"]]
+
+    def test_router_outside_opted_in_views(self):
+        router = ReplicaRouter()
+        assert router.db_for_read(Project) == "default"
+        token = routers.replica_reads.set(True)
+        try:
+            assert router.db_for_read(Project) == "replica"
+            assert router.db_for_write(Project) == "default"
+        finally:
+            routers.replica_reads.reset(token)
+
+    def test_write_pins_client_to_primary(self, client, project):
+        client.force_login(project.student.user)
+        response = client.post(
+            reverse("projects:project_transition", args=[project.pk]),
+            {"new_status": "in_progress"},
+        )
+        assert response.cookies[routers.PIN_COOKIE]["max-age"] == 10  # noqa: PLR2004
+        assert not self.replica_reads(client, reverse("projects:project_list"))
+
+        del client.cookies[routers.PIN_COOKIE]
+        assert self.replica_reads(client, reverse("projects:project_list"))
+
+    @pytest.mark.parametrize("lag", [60.0, None])
+    def test_lagging_replica_falls_back_to_primary(self, client, student, lag):
+        client.force_login(student.user)
+        with mock.patch.object(routers, "measure_lag", return_value=lag):
+            assert not self.replica_reads(client, reverse("projects:course_list"))
+
+    def test_lag_of_caught_up_replica(self):
+        assert routers.measure_lag("replica") == 0
+
+    def test_bulk_transition_stays_on_primary(self, project):
+        with self.routed_to_replica():
+            moved = Project.objects.filter(pk=project.pk).bulk_transition(
+                "in_progress",
+            )
+        assert moved == [project.pk]
+        project.refresh_from_db()
+        assert project.status == "in_progress"
+
+    def test_transition_of_replica_instance_writes_to_primary(self, project):
+        # As loaded by a replica-routed view.
+        project._state.db = "replica"  # noqa: SLF001
+        with self.routed_to_replica():
+            assert project.transition_to("in_progress")
+        assert Project.objects.get(pk=project.pk).status == "in_progress"
+
+    def test_task_toggle_stays_on_primary(self, project):
+        task = Task.objects.create(title="Task 1", project=project)
+        with self.routed_to_replica():
+            assert Task.objects.toggle_completion(task.pk)[0] is True
+        project.refresh_from_db()
+        assert project.completed_task_count == 1
+
+    def test_task_bulk_writes_stay_on_primary(self, project):
+        with self.routed_to_replica():
+            Task.objects.bulk_create([Task(title="Task 1", project=project)])
+            Task.objects.filter(project=project).update(is_completed=True)
+        project.refresh_from_db()
+        assert (project.task_count, project.completed_task_count) == (1, 1)
+
+
 class TestTaskModel:
     """Test Task model."""
 
@@ -208,6 +1266,243 @@ class TestTaskModel:
         assert task.completed_at is None
 
 
+class TestProjectTaskCounters:
+    """Test denormalized task counters on Project."""
+
+    def test_create_and_toggle(self, project):
+        task = Task.objects.create(title="Task 1", project=project)
+        Task.objects.create(title="Task 2", project=project, is_completed=True)
+        project.refresh_from_db()
+        assert (project.task_count, project.completed_task_count) == (2, 1)
+
+        task.is_completed = True
+        task.save()
+        project.refresh_from_db()
+        assert project.completed_task_count == 2  # noqa: PLR2004
+
+    def test_delete(self, project):
+        task = Task.objects.create(title="Task 1", project=project, is_completed=True)
+        Task.objects.create(title="Task 2", project=project)
+        Task.objects.create(title="Task 3", project=project)
+        task.delete()
+        project.refresh_from_db()
+        assert (project.task_count, project.completed_task_count) == (2, 0)
+
+        project.tasks.all().delete()
+        project.refresh_from_db()
+        assert (project.task_count, project.completed_task_count) == (0, 0)
+
+    def test_bulk_create_and_update(self, project):
+        Task.objects.bulk_create(
+            [Task(title=f"Task {i}", project=project) for i in range(3)],
+        )
+        project.refresh_from_db()
+        assert project.task_count == 3  # noqa: PLR2004
+
+        project.tasks.filter(title="Task 0").update(is_completed=True)
+        project.refresh_from_db()
+        assert project.completed_task_count == 1
+
+    def test_toggle_view(self, client, project, django_assert_num_queries):
+        client.force_login(project.student.user)
+        task = Task.objects.create(title="Task 1", project=project)
+        url = reverse("projects:task_update", args=[task.pk])
+
+        # Session and user, then the toggle statement; no request savepoints.
+        with django_assert_num_queries(3):
+            data = client.post(url).json()
+        assert data["is_completed"] is True
+        assert data["completed_at"] is not None
+        project.refresh_from_db()
+        assert project.completed_task_count == 1
+
+        data = client.post(url).json()
+        assert (data["is_completed"], data["completed_at"]) == (False, None)
+        project.refresh_from_db()
+        assert project.completed_task_count == 0
+        response = client.post(reverse("projects:task_update", args=[0]))
+        assert response.status_code == 404  # noqa: PLR2004
+
+    def test_stale_project_save_keeps_counters(self, project):
+        stale = Project.objects.get(pk=project.pk)
+        Task.objects.create(title="Task 1", project=project)
+        stale.title = "Renamed"
+        stale.save()
+        project.refresh_from_db()
+        assert project.task_count == 1
+
+    def test_deferred_project_save(self, project, django_assert_num_queries):
+        deferred = Project.objects.only("title").get(pk=project.pk)
+        Task.objects.create(title="Task 1", project=project)
+        deferred.title = "Renamed"
+        # The update of the title, then the course id for cache invalidation.
+        with django_assert_num_queries(2):
+            deferred.save()
+        project.refresh_from_db()
+        assert (project.title, project.task_count) == ("Renamed", 1)
+
+    def test_save_of_deleted_project_inserts_it(self, project):
+        Task.objects.create(title="Task 1", project=project)
+        Project.objects.filter(pk=project.pk).delete()
+        project.save()
+        assert Project.objects.filter(pk=project.pk).exists()
+
+    def test_rebuild_command(self, project):
+        Task.objects.create(title="Task 1", project=project, is_completed=True)
+        Project.objects.update(task_count=10, completed_task_count=7)
+        call_command("rebuild_task_counters", stdout=None)
+        project.refresh_from_db()
+        assert (project.task_count, project.completed_task_count) == (1, 1)
+
+
+class TestCourseStats:
+    """Test the incrementally maintained per-course statistics."""
+
+    def stats(self, course):
+        return CourseStats.objects.get(course=course)
+
+    def test_created_with_course(self, course):
+        stats = self.stats(course)
+        assert stats.project_count == 0
+        assert stats.overdue_computed_on == timezone.now().date()
+
+    def test_project_lifecycle(self, project, course, student):
+        Project.objects.create(
+            title="Graded",
+            description="Test",
+            course=course,
+            student=student,
+            status="completed",
+            score=90,
+        )
+        project.transition_to("in_progress")
+        stats = self.stats(course)
+        assert stats.project_count == 2  # noqa: PLR2004
+        assert (stats.draft_count, stats.in_progress_count) == (0, 1)
+        assert (stats.graded_count, stats.score_sum) == (1, 90)
+        assert stats.average_score == 90.0  # noqa: PLR2004
+
+        project.delete()
+        stats = self.stats(course)
+        assert (stats.project_count, stats.in_progress_count) == (1, 0)
+
+    def test_overdue_and_course_move(self, project, course):
+        other = Course.objects.create(
+            name="Other",
+            code="OC101",
+            start_date=course.start_date,
+            end_date=course.end_date,
+        )
+        project.deadline = timezone.now().date() - timezone.timedelta(days=1)
+        project.save()
+        assert self.stats(course).overdue_count == 1
+
+        project.course = other
+        project.save()
+        assert self.stats(course).overdue_count == 0
+        assert self.stats(other).overdue_count == 1
+        assert self.stats(other).project_count == 1
+
+    def test_stale_rows_are_rebuilt(self, project, course):
+        CourseStats.objects.filter(course=course).update(
+            project_count=0,
+            overdue_computed_on=timezone.now().date() - timezone.timedelta(days=1),
+        )
+        with CaptureQueriesContext(connection) as queries:
+            assert CourseStats.refresh_stale() == 1
+        assert any("FOR UPDATE" in query["sql"] for query in queries)
+        assert self.stats(course).project_count == 1
+        assert CourseStats.refresh_stale() == 0
+
+    def test_refresh_stale_command(self, project, course):
+        CourseStats.objects.filter(course=course).update(
+            overdue_count=3,
+            overdue_computed_on=timezone.now().date() - timezone.timedelta(days=1),
+        )
+        call_command("rebuild_course_stats", "--stale", stdout=io.StringIO())
+        stats = self.stats(course)
+        assert (stats.overdue_count, stats.overdue_computed_on) == (
+            0,
+            timezone.now().date(),
+        )
+
+    def test_stale_rows_keep_counting(self, project, course, student):
+        yesterday = timezone.now().date() - timezone.timedelta(days=1)
+        CourseStats.objects.filter(course=course).update(
+            overdue_count=5,
+            overdue_computed_on=yesterday,
+        )
+        Project.objects.create(
+            title="Late",
+            course=course,
+            student=student,
+            deadline=yesterday,
+        )
+        project.transition_to("in_progress")
+
+        stats = self.stats(course)
+        assert (stats.project_count, stats.draft_count) == (2, 1)
+        assert stats.in_progress_count == 1
+        # Only valid for the day it was computed on, so left for the rebuild.
+        assert (stats.overdue_count, stats.overdue_computed_on) == (5, yesterday)
+
+    def test_course_list_without_stats_row(self, client, course, student):
+        CourseStats.objects.filter(course=course).delete()
+        client.force_login(student.user)
+        response = client.get(reverse("projects:course_list"))
+        assert [c.project_count for c in response.context["courses"]] == [0]
+
+    def test_course_detail_without_stats_row(self, client, project, course):
+        CourseStats.objects.filter(course=course).delete()
+        client.force_login(project.student.user)
+        response = client.get(reverse("projects:course_detail", args=[course.pk]))
+        assert response.context["stats"]["total_projects"] == 0
+        assert not CourseStats.objects.filter(course=course).exists()
+
+    def test_rebuild_command(self, project, course):
+        CourseStats.objects.filter(course=course).update(project_count=42)
+        call_command("rebuild_course_stats", stdout=None)
+        assert self.stats(course).project_count == 1
+
+
+class TestStudentStats:
+    """Test the incrementally maintained per-student summary."""
+
+    def stats(self, student):
+        return StudentStats.objects.get(student=student)
+
+    def test_score_and_status_changes(self, project, course, student):
+        project.transition_to("in_progress")
+        stats = self.stats(student)
+        assert (stats.project_count, stats.active_count) == (1, 1)
+        assert stats.average_score is None
+
+        project.transition_to("review")
+        project.transition_to("completed")
+        project.score = 70
+        project.save()
+        Project.objects.create(
+            title="Second",
+            description="Test",
+            course=course,
+            student=student,
+            status="completed",
+            score=90,
+        )
+        stats = self.stats(student)
+        assert (stats.active_count, stats.completed_count) == (0, 2)
+        assert (stats.graded_count, stats.score_sum) == (2, 160)
+        assert stats.average_score == 80.0  # noqa: PLR2004
+
+        project.delete()
+        assert self.stats(student).average_score == 90.0  # noqa: PLR2004
+
+    def test_rebuild_command(self, project, student):
+        StudentStats.objects.filter(student=student).update(project_count=9)
+        call_command("rebuild_student_stats", stdout=None)
+        assert self.stats(student).project_count == 1
+
+
 class TestEnrollmentModel:
     """Test Enrollment model."""
 
@@ -27,6 +27,11 @@ urlpatterns = [
         views.CourseDeleteView.as_view(),
         name="course_delete",
     ),
+    path(
+        "courses/<int:pk>/gradebook/",
+        views.CourseGradebookView.as_view(),
+        name="course_gradebook",
+    ),
     # Students
     path("students/", views.StudentListView.as_view(), name="student_list"),
     path(
@@ -36,6 +41,11 @@ urlpatterns = [
     ),
     # Projects
     path("projects/", views.ProjectListView.as_view(), name="project_list"),
+    path(
+        "projects/bulk-transition/",
+        views.ProjectBulkTransitionView.as_view(),
+        name="project_bulk_transition",
+    ),
     path(
         "projects/create/",
         views.ProjectCreateView.as_view(),
@@ -67,6 +77,17 @@ urlpatterns = [
         views.TaskCreateView.as_view(),
         name="task_create",
     ),
+    path(
+        "projects/<int:project_pk>/tasks/bulk-create/",
+        views.TaskBulkCreateView.as_view(),
+        name="task_bulk_create",
+    ),
+    path(
+        "projects/<int:project_pk>/tasks/reorder/",
+        views.TaskReorderView.as_view(),
+        name="task_reorder",
+    ),
     path("tasks/<int:pk>/update/", views.TaskUpdateView.as_view(), name="task_update"),
     path("tasks/<int:pk>/delete/", views.TaskDeleteView.as_view(), name="task_delete"),
+    path("tasks/<int:pk>/move/", views.TaskMoveView.as_view(), name="task_move"),
 ]
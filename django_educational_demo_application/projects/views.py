@@ -1,17 +1,24 @@
 """Views for educational project management."""
 
+import json
+
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib.messages.views import SuccessMessageMixin
+from django.core.cache import cache
+from django.db import router
 from django.db import transaction
-from django.db.models import Avg
 from django.db.models import Count
-from django.db.models import Q
+from django.db.models import F
+from django.db.models import Sum
+from django.db.models.functions import Coalesce
+from django.http import Http404
 from django.http import JsonResponse
 from django.shortcuts import get_object_or_404
 from django.shortcuts import render
 from django.urls import reverse
 from django.urls import reverse_lazy
 from django.utils import timezone
+from django.utils.decorators import method_decorator
 from django.views.generic import CreateView
 from django.views.generic import DeleteView
 from django.views.generic import DetailView
@@ -19,40 +26,71 @@ from django.views.generic import ListView
 from django.views.generic import UpdateView
 from django.views.generic import View
 
+from config.routers import primary_reads
+
+from .cache import CACHE_TIMEOUT
+from .cache import course_stats_key
+from .cache import dashboard_key
+from .cache import remember_dashboard_projects
+from .exports import EXPORT_CHUNK_SIZE
+from .exports import gradebook
+from .exports import stream_csv
+from .exports import stream_ndjson
 from .forms import CourseForm
+from .forms import ProjectBulkTransitionForm
 from .forms import ProjectForm
 from .forms import ProjectStatusTransitionForm
+from .forms import TaskBulkForm
 from .forms import TaskForm
+from .forms import TaskMoveForm
+from .forms import TaskReorderForm
+from .metrics import record_cache_lookup
 from .models import Course
+from .models import CourseStats
 from .models import Project
 from .models import Student
 from .models import Task
+from .pagination import CursorPaginationMixin
+from .pagination import EstimatedCountPaginator
 
 
-class CourseListView(LoginRequiredMixin, ListView):
+@method_decorator(transaction.non_atomic_requests, name="dispatch")
+class CourseListView(LoginRequiredMixin, CursorPaginationMixin, ListView):
     """List all courses."""
 
     model = Course
     template_name = "projects/course_list.html"
+    replica_reads = True
     context_object_name = "courses"
     paginate_by = 10
+    cursor_ordering = ("-start_date", "-id")
 
     def get_queryset(self):
-        """Filter courses by active status if requested."""
-        queryset = Course.objects.annotate(
-            project_count=Count("projects"),
+        """Filter courses by active flag and date-based status if requested."""
+        queryset = Course.objects.with_status().annotate(
+            project_count=Coalesce(F("stats__project_count"), 0),
             student_count=Count("enrollments"),
         )
         if self.request.GET.get("active_only"):
             queryset = queryset.filter(is_active=True)
+        status = self.request.GET.get("status")
+        if status in dict(Course.STATUS_CHOICES):
+            queryset = queryset.filter_status(status)
         return queryset
 
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["statuses"] = Course.STATUS_CHOICES
+        return context
 
+
+@method_decorator(transaction.non_atomic_requests, name="dispatch")
 class CourseDetailView(LoginRequiredMixin, DetailView):
     """Display course details with projects and students."""
 
     model = Course
     template_name = "projects/course_detail.html"
+    replica_reads = True
     context_object_name = "course"
 
     def get_context_data(self, **kwargs):
@@ -69,16 +107,16 @@ class CourseDetailView(LoginRequiredMixin, DetailView):
         # Get enrollments
         enrollments = course.enrollments.select_related("student__user").all()
 
-        # Calculate statistics
-        stats = {
-            "total_projects": projects.count(),
-            "completed_projects": projects.filter(status="completed").count(),
-            "in_progress_projects": projects.filter(status="in_progress").count(),
-            "average_score": projects.filter(score__isnull=False).aggregate(
-                Avg("score"),
-            )["score__avg"]
-            or 0,
-        }
+        # Statistics are read from the maintained rollup row and cached until
+        # the course's version is bumped
+        key = course_stats_key(course.pk)
+        stats = cache.get(key)
+        record_cache_lookup("course_stats", stats)
+        if stats is None:
+            # A lagging replica must not end up in the cache
+            with primary_reads():
+                stats = self.get_stats(course)
+            cache.set(key, stats, CACHE_TIMEOUT)
 
         context.update(
             {
@@ -89,6 +127,29 @@ class CourseDetailView(LoginRequiredMixin, DetailView):
         )
         return context
 
+    def get_stats(self, course: Course) -> dict:
+        # The row is created with the course, so a GET never writes one; a
+        # missing row reads as empty until rebuild_course_stats runs.
+        course_stats = getattr(course, "stats", None)
+        if course_stats is None:
+            course_stats = CourseStats(course_id=course.pk)
+        return {
+            "total_projects": course_stats.project_count,
+            "completed_projects": course_stats.completed_count,
+            "in_progress_projects": course_stats.in_progress_count,
+            "average_score": course_stats.average_score or 0,
+        }
+
+
+@method_decorator(transaction.non_atomic_requests, name="dispatch")
+class CourseGradebookView(LoginRequiredMixin, View):
+    """Stream a course gradebook: one row per enrolled student, columns per project."""
+
+    def get(self, request, pk):
+        course = get_object_or_404(Course, pk=pk)
+        header, rows = gradebook(course, timezone.now().date())
+        return stream_csv(f"{course.code}-gradebook.csv", header, rows)
+
 
 class CourseCreateView(LoginRequiredMixin, SuccessMessageMixin, CreateView):
     """Create a new course."""
@@ -123,39 +184,43 @@ class CourseDeleteView(LoginRequiredMixin, SuccessMessageMixin, DeleteView):
     success_message = "Course deleted successfully!"
 
 
-class StudentListView(LoginRequiredMixin, ListView):
+@method_decorator(transaction.non_atomic_requests, name="dispatch")
+class StudentListView(LoginRequiredMixin, CursorPaginationMixin, ListView):
     """List all students."""
 
     model = Student
     template_name = "projects/student_list.html"
+    replica_reads = True
     context_object_name = "students"
     paginate_by = 20
+    cursor_ordering = ("user__username", "id")
 
     def get_queryset(self):
         """Filter and annotate students."""
         queryset = Student.objects.select_related("user").annotate(
-            project_count=Count("projects"),
-            completed_count=Count("projects", filter=Q(projects__status="completed")),
+            project_count=Coalesce(F("stats__project_count"), 0),
+            completed_count=Coalesce(F("stats__completed_count"), 0),
         )
 
         search = self.request.GET.get("search")
         if search:
-            queryset = queryset.filter(
-                Q(user__username__icontains=search)
-                | Q(student_id__icontains=search)
-                | Q(group__icontains=search),
-            )
+            queryset = queryset.search(search)
 
         return queryset
 
 
+@method_decorator(transaction.non_atomic_requests, name="dispatch")
 class StudentDetailView(LoginRequiredMixin, DetailView):
     """Display student details with their projects."""
 
     model = Student
     template_name = "projects/student_detail.html"
+    replica_reads = True
     context_object_name = "student"
 
+    def get_queryset(self):
+        return Student.objects.select_related("user", "stats")
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         student = self.object
@@ -178,20 +243,67 @@ class StudentDetailView(LoginRequiredMixin, DetailView):
         return context
 
 
-class ProjectListView(LoginRequiredMixin, ListView):
+@method_decorator(transaction.non_atomic_requests, name="dispatch")
+class ProjectListView(LoginRequiredMixin, CursorPaginationMixin, ListView):
     """List all projects with filtering."""
 
     model = Project
     template_name = "projects/project_list.html"
+    replica_reads = True
     context_object_name = "projects"
     paginate_by = 15
+    paginator_class = EstimatedCountPaginator
+    cursor_ordering = ("-created_at", "-id")
+    # Export column name -> queryset lookup
+    export_fields = {
+        "id": "pk",
+        "title": "title",
+        "student": "student__user__username",
+        "student_id": "student__student_id",
+        "course": "course__code",
+        "status": "status",
+        "priority": "priority",
+        "score": "score",
+        "deadline": "deadline",
+        "overdue": "overdue",
+        "created_at": "created_at",
+        "completed_at": "completed_at",
+        "task_count": "task_count",
+        "completed_task_count": "completed_task_count",
+    }
+
+    def get(self, request, *args, **kwargs):
+        export = request.GET.get("export")
+        if export in ("csv", "ndjson"):
+            return self.export(export)
+        return super().get(request, *args, **kwargs)
+
+    def export(self, export_format: str):
+        """
+        Stream the filtered projects without pagination.
+
+        Rows come from a server-side cursor in fixed-size chunks, so memory
+        use does not depend on the size of the result. They are read while
+        the response streams, after ReplicaRoutingMiddleware has reset the
+        routing flag, so the read alias is bound to the queryset up front.
+        """
+        fields = list(self.export_fields)
+        rows = (
+            self.get_queryset()
+            .using(router.db_for_read(Project))
+            .values_list(*self.export_fields.values())
+            .iterator(chunk_size=EXPORT_CHUNK_SIZE)
+        )
+        if export_format == "csv":
+            return stream_csv("projects.csv", fields, rows)
+        return stream_ndjson("projects.ndjson", fields, rows)
 
     def get_queryset(self):
         """Filter projects based on query parameters."""
         queryset = Project.objects.select_related(
             "student__user",
             "course",
-        ).prefetch_related("tasks")
+        ).with_overdue()
 
         # Filter by status
         status = self.request.GET.get("status")
@@ -213,17 +325,14 @@ class ProjectListView(LoginRequiredMixin, ListView):
         if priority:
             queryset = queryset.filter(priority=priority)
 
-        # Search by title
+        # Full-text search over title and description
         search = self.request.GET.get("search")
         if search:
-            queryset = queryset.filter(title__icontains=search)
+            queryset = queryset.search(search)
 
         # Filter overdue
         if self.request.GET.get("overdue"):
-            queryset = queryset.filter(
-                deadline__lt=timezone.now().date(),
-                status__in=["draft", "in_progress", "review"],
-            )
+            queryset = queryset.overdue()
 
         return queryset
 
@@ -236,13 +345,18 @@ class ProjectListView(LoginRequiredMixin, ListView):
         return context
 
 
+@method_decorator(transaction.non_atomic_requests, name="dispatch")
 class ProjectDetailView(LoginRequiredMixin, DetailView):
     """Display project details with tasks and status history."""
 
     model = Project
     template_name = "projects/project_detail.html"
+    replica_reads = True
     context_object_name = "project"
 
+    def get_queryset(self):
+        return Project.objects.select_related("student__user", "course")
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         project = self.object
@@ -266,6 +380,7 @@ class ProjectDetailView(LoginRequiredMixin, DetailView):
                 "status_logs": status_logs,
                 "allowed_transitions": allowed_transitions,
                 "transition_form": ProjectStatusTransitionForm(project=project),
+                "task_bulk_form": TaskBulkForm(),
                 "task_form": TaskForm(),
             },
         )
@@ -307,6 +422,9 @@ class ProjectUpdateView(LoginRequiredMixin, SuccessMessageMixin, UpdateView):
     template_name = "projects/project_form.html"
     success_message = "Project updated successfully!"
 
+    def get_queryset(self):
+        return Project.objects.select_related("student__user")
+
     def get_success_url(self):
         return reverse("projects:project_detail", kwargs={"pk": self.object.pk})
 
@@ -319,6 +437,9 @@ class ProjectDeleteView(LoginRequiredMixin, SuccessMessageMixin, DeleteView):
     success_url = reverse_lazy("projects:project_list")
     success_message = "Project deleted successfully!"
 
+    def get_queryset(self):
+        return Project.objects.select_related("student__user")
+
 
 class ProjectStatusTransitionView(LoginRequiredMixin, View):
     """Handle project status transition."""
@@ -331,14 +452,19 @@ class ProjectStatusTransitionView(LoginRequiredMixin, View):
             new_status = form.cleaned_data["new_status"]
             comment = form.cleaned_data.get("comment", "")
 
-            if project.transition_to(new_status, user=request.user):
-                # Update comment if provided
-                if comment:
-                    log = project.status_logs.first()
-                    log.comment = comment
-                    log.save()
-
+            if project.transition_to(new_status, user=request.user, comment=comment):
                 return JsonResponse({"success": True, "status": new_status})
+            # The form accepted the transition from the status loaded above,
+            # so another request has changed the project since.
+            return JsonResponse(
+                {
+                    "success": False,
+                    "errors": {
+                        "new_status": ["The project status was changed meanwhile."],
+                    },
+                },
+                status=409,
+            )
 
         return JsonResponse(
             {"success": False, "errors": form.errors},
@@ -346,18 +472,71 @@ class ProjectStatusTransitionView(LoginRequiredMixin, View):
         )
 
 
+class ProjectBulkTransitionView(LoginRequiredMixin, View):
+    """Move many projects to a new status in one request."""
+
+    def post(self, request):
+        if request.content_type == "application/json":
+            try:
+                payload = json.loads(request.body)
+            except ValueError:
+                payload = None
+            if not isinstance(payload, dict) or not isinstance(
+                payload.get("project_ids"),
+                list,
+            ):
+                return JsonResponse(
+                    {
+                        "success": False,
+                        "errors": {"project_ids": ["Expected a JSON array of ids."]},
+                    },
+                    status=400,
+                )
+            form = ProjectBulkTransitionForm(
+                {
+                    **payload,
+                    "project_ids": ",".join(map(str, payload["project_ids"])),
+                },
+            )
+        else:
+            form = ProjectBulkTransitionForm(request.POST)
+
+        if not form.is_valid():
+            return JsonResponse({"success": False, "errors": form.errors}, status=400)
+
+        project_ids = set(form.cleaned_data["project_ids"])
+        new_status = form.cleaned_data["new_status"]
+        moved = Project.objects.filter(pk__in=project_ids).bulk_transition(
+            new_status,
+            user=request.user,
+            comment=form.cleaned_data["comment"],
+        )
+        return JsonResponse(
+            {
+                "success": True,
+                "status": new_status,
+                "transitioned": sorted(moved),
+                "skipped": sorted(project_ids.difference(moved)),
+            },
+        )
+
+
 class TaskCreateView(LoginRequiredMixin, View):
     """Create a new task for a project."""
 
     def post(self, request, project_pk):
-        project = get_object_or_404(Project, pk=project_pk)
+        # Lock the project so concurrent adds do not pick the same order.
+        project = get_object_or_404(
+            Project.objects.select_for_update().with_last_task_order(),
+            pk=project_pk,
+        )
         form = TaskForm(request.POST)
 
         if form.is_valid():
             task = form.save(commit=False)
             task.project = project
             if not task.order:
-                task.order = project.tasks.count() + 1
+                task.order = project.last_task_order + Task.ORDER_GAP
             task.save()
 
             if request.headers.get("X-Requested-With") == "XMLHttpRequest":
@@ -374,19 +553,146 @@ class TaskCreateView(LoginRequiredMixin, View):
         return JsonResponse({"success": False, "errors": form.errors}, status=400)
 
 
+class TaskBulkCreateView(LoginRequiredMixin, View):
+    """Create many tasks for a project in one request."""
+
+    def post(self, request, project_pk):
+        # Lock the project so concurrent adds do not pick the same orders.
+        project = get_object_or_404(
+            Project.objects.select_for_update().with_last_task_order(),
+            pk=project_pk,
+        )
+
+        if request.content_type == "application/json":
+            try:
+                payload = json.loads(request.body)
+            except ValueError:
+                payload = None
+            titles = payload.get("titles") if isinstance(payload, dict) else payload
+            if not isinstance(titles, list) or not all(
+                isinstance(title, str) for title in titles
+            ):
+                return JsonResponse(
+                    {
+                        "success": False,
+                        "errors": {"titles": ["Expected a JSON array of titles."]},
+                    },
+                    status=400,
+                )
+            form = TaskBulkForm({"titles": "\n".join(titles)})
+        else:
+            form = TaskBulkForm(request.POST)
+
+        if not form.is_valid():
+            return JsonResponse({"success": False, "errors": form.errors}, status=400)
+
+        tasks = Task.objects.bulk_create(
+            Task(
+                project=project,
+                title=title,
+                order=project.last_task_order + position * Task.ORDER_GAP,
+            )
+            for position, title in enumerate(form.cleaned_data["titles"], start=1)
+        )
+        return JsonResponse(
+            {"success": True, "task_ids": [task.pk for task in tasks]},
+            status=201,
+        )
+
+
+class TaskMoveView(LoginRequiredMixin, View):
+    """Move one task right after another task of the same project."""
+
+    def post(self, request, pk):
+        # Lock the project so concurrent moves do not pick the same gap.
+        task = get_object_or_404(
+            Task.objects.select_related("project").select_for_update(of=("project",)),
+            pk=pk,
+        )
+        form = TaskMoveForm(request.POST)
+        if not form.is_valid():
+            return JsonResponse({"success": False, "errors": form.errors}, status=400)
+
+        after = form.cleaned_data["after"]
+        if after != task.pk:
+            previous = None
+            if after is not None:
+                previous = get_object_or_404(Task, pk=after, project_id=task.project_id)
+            task.move_after(previous)
+        return JsonResponse({"success": True, "order": task.order})
+
+
+class TaskReorderView(LoginRequiredMixin, View):
+    """Apply a complete new order of a project's tasks, e.g. after drag and drop."""
+
+    def post(self, request, project_pk):
+        project = get_object_or_404(Project.objects.select_for_update(), pk=project_pk)
+
+        if request.content_type == "application/json":
+            try:
+                payload = json.loads(request.body)
+            except ValueError:
+                payload = None
+            task_ids = payload.get("task_ids") if isinstance(payload, dict) else payload
+            if not isinstance(task_ids, list):
+                return JsonResponse(
+                    {
+                        "success": False,
+                        "errors": {"task_ids": ["Expected a JSON array of ids."]},
+                    },
+                    status=400,
+                )
+            form = TaskReorderForm({"task_ids": ",".join(map(str, task_ids))})
+        else:
+            form = TaskReorderForm(request.POST)
+
+        if not form.is_valid():
+            return JsonResponse({"success": False, "errors": form.errors}, status=400)
+
+        task_ids = form.cleaned_data["task_ids"]
+        # The related manager reads project_id of every row; deferring it
+        # would cost a query per task.
+        tasks = {
+            task.pk: task for task in project.tasks.only("pk", "project_id", "order")
+        }
+        if set(task_ids) != tasks.keys():
+            return JsonResponse(
+                {
+                    "success": False,
+                    "errors": {"task_ids": ["List every task of the project once."]},
+                },
+                status=400,
+            )
+
+        changed = []
+        for position, task_id in enumerate(task_ids, start=1):
+            task = tasks[task_id]
+            if task.order != position * Task.ORDER_GAP:
+                task.order = position * Task.ORDER_GAP
+                changed.append(task)
+        Task.objects.bulk_update(changed, ["order"], batch_size=1000)
+        return JsonResponse({"success": True, "updated": len(changed)})
+
+
+@method_decorator(transaction.non_atomic_requests, name="dispatch")
 class TaskUpdateView(LoginRequiredMixin, View):
-    """Update task completion status."""
+    """
+    Update task completion status.
+
+    The toggle is a single statement, so the request transaction is skipped.
+    """
 
     def post(self, request, pk):
-        task = get_object_or_404(Task, pk=pk)
-        task.is_completed = not task.is_completed
-        task.save()
+        try:
+            is_completed, completed_at = Task.objects.toggle_completion(pk)
+        except Task.DoesNotExist as exc:
+            raise Http404 from exc
 
         return JsonResponse(
             {
                 "success": True,
-                "is_completed": task.is_completed,
-                "completed_at": str(task.completed_at) if task.completed_at else None,
+                "is_completed": is_completed,
+                "completed_at": str(completed_at) if completed_at else None,
             },
         )
 
@@ -407,31 +713,38 @@ class TaskDeleteView(LoginRequiredMixin, DeleteView):
         return reverse("projects:project_detail", kwargs={"pk": project_pk})
 
 
+@method_decorator(transaction.non_atomic_requests, name="dispatch")
 class DashboardView(LoginRequiredMixin, View):
     """Main dashboard showing project statistics."""
 
     template_name = "projects/dashboard.html"
 
     def get(self, request):
-        # Overall statistics
-        total_projects = Project.objects.count()
-        completed_projects = Project.objects.filter(status="completed").count()
-        in_progress_projects = Project.objects.filter(status="in_progress").count()
-        overdue_projects = Project.objects.filter(
-            deadline__lt=timezone.now().date(),
-            status__in=["draft", "in_progress", "review"],
-        ).count()
+        key = dashboard_key(timezone.now().date())
+        context = cache.get(key)
+        record_cache_lookup("dashboard", context)
+        if context is None:
+            context = self.get_dashboard_data()
+            remember_dashboard_projects(
+                project.pk for project in context["recent_projects"]
+            )
+            cache.set(key, context, CACHE_TIMEOUT)
+        return render(request, self.template_name, context)
+
+    def get_dashboard_data(self) -> dict:
+        """Compute the dashboard context, with every widget evaluated."""
+        # Overall statistics, summed from the per-course rollup
+        CourseStats.refresh_stale()
+        totals = CourseStats.objects.aggregate(
+            total_projects=Coalesce(Sum("project_count"), 0),
+            completed_projects=Coalesce(Sum("completed_count"), 0),
+            in_progress_projects=Coalesce(Sum("in_progress_count"), 0),
+            overdue_projects=Coalesce(Sum("overdue_count"), 0),
+        )
 
         # By course
         course_stats = (
-            Course.objects.annotate(
-                project_count=Count("projects"),
-                completed_count=Count(
-                    "projects",
-                    filter=Q(projects__status="completed"),
-                ),
-                avg_score=Avg("projects__score"),
-            )
+            Course.objects.select_related("stats")
             .filter(is_active=True)
             .order_by("-start_date")[:5]
         )
@@ -442,24 +755,20 @@ class DashboardView(LoginRequiredMixin, View):
             "course",
         ).order_by("-created_at")[:5]
 
-        # Top students by average score
+        # Top students by average score, read from the rollup index
         top_students = (
-            Student.objects.annotate(
-                avg_score=Avg("projects__score"),
-                project_count=Count("projects"),
+            Student.objects.select_related("user")
+            .filter(stats__graded_count__gt=0)
+            .annotate(
+                avg_score=F("stats__average_score"),
+                project_count=F("stats__project_count"),
             )
-            .filter(projects__score__isnull=False)
-            .order_by("-avg_score")[:5]
+            .order_by(F("stats__average_score").desc())[:5]
         )
 
-        context = {
-            "total_projects": total_projects,
-            "completed_projects": completed_projects,
-            "in_progress_projects": in_progress_projects,
-            "overdue_projects": overdue_projects,
-            "course_stats": course_stats,
-            "recent_projects": recent_projects,
-            "top_students": top_students,
+        return {
+            **totals,
+            "course_stats": list(course_stats),
+            "recent_projects": list(recent_projects),
+            "top_students": list(top_students),
         }
-
-        return render(request, self.template_name, context)
@@ -2,5 +2,9 @@
 set -e
 
 python manage.py migrate --noinput
+python manage.py status_log_partitions
 
-exec gunicorn config.wsgi:application --bind 0.0.0.0:8000
+# Shared by the gunicorn workers for their Prometheus metrics.
+export PROMETHEUS_MULTIPROC_DIR="${PROMETHEUS_MULTIPROC_DIR:-/dev/shm/prometheus}"
+
+exec gunicorn config.wsgi:application --config gunicorn.conf.py
@@ -0,0 +1,105 @@
+"""
+Gunicorn settings, read from the same environment as the Django settings.
+
+Each worker process opens its own database connection pool of up to
+DJANGO_DB_POOL_MAX_SIZE connections (one per thread by default). The server
+refuses to start when all workers together could exceed
+DJANGO_DB_CONNECTION_BUDGET, the share of the database's max_connections set
+aside for the web workers.
+
+With PROMETHEUS_MULTIPROC_DIR set, the workers share their Prometheus metrics
+through files in that directory (see config/metrics.py). The directory is
+emptied when the server starts and the files of a dead worker are dropped.
+"""
+
+import multiprocessing
+import os
+import shutil
+from pathlib import Path
+
+
+def env_int(name: str, default: int) -> int:
+    return int(os.environ.get(name, default))
+
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:8000")
+workers = env_int("WEB_CONCURRENCY", min(multiprocessing.cpu_count() * 2 + 1, 8))
+threads = env_int("GUNICORN_THREADS", 1)
+timeout = env_int("GUNICORN_TIMEOUT", 30)
+graceful_timeout = env_int("GUNICORN_GRACEFUL_TIMEOUT", 30)
+keepalive = env_int("GUNICORN_KEEPALIVE", 5)
+# Recycle workers now and then so a slow leak cannot grow without bound.
+max_requests = env_int("GUNICORN_MAX_REQUESTS", 1000)
+max_requests_jitter = env_int("GUNICORN_MAX_REQUESTS_JITTER", 100)
+# Heartbeat files on tmpfs; a disk-backed /tmp can stall workers.
+worker_tmp_dir = "/dev/shm"  # noqa: S108
+accesslog = "-"
+errorlog = "-"
+
+pool_max_size = env_int("DJANGO_DB_POOL_MAX_SIZE", threads)
+connection_budget = env_int("DJANGO_DB_CONNECTION_BUDGET", 0)
+
+
+def connections_needed() -> int:
+    """Return how many connections all workers may hold on each database."""
+    if os.environ.get("DJANGO_DB_POOL", "True").lower() in {"false", "0", "no"}:
+        # Without a pool every thread keeps its own persistent connection.
+        return workers * threads
+    return workers * pool_max_size
+
+
+def on_starting(server):
+    metrics_dir = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if metrics_dir:
+        # Values left by a previous run would be added to the new ones.
+        shutil.rmtree(metrics_dir, ignore_errors=True)
+        Path(metrics_dir).mkdir(parents=True)
+
+    needed = connections_needed()
+    server.log.info(
+        "Database connections: %d worker(s) may hold up to %d per database "
+        "(budget: %s).",
+        workers,
+        needed,
+        connection_budget or "unset",
+    )
+    if connection_budget and needed > connection_budget:
+        msg = (
+            f"{workers} worker(s) may open {needed} database connections, more "
+            f"than DJANGO_DB_CONNECTION_BUDGET={connection_budget}. Lower "
+            "WEB_CONCURRENCY or DJANGO_DB_POOL_MAX_SIZE."
+        )
+        raise RuntimeError(msg)
+
+
+def worker_exit(server, worker):
+    # Close pooled connections instead of leaving them to the server timeout.
+    from config.pools import close_pools
+
+    close_pools()
+
+
+def post_worker_init(worker):
+    from config.metrics import WORKERS
+
+    WORKERS.set(1)
+
+
+def pre_request(worker, req):
+    from config.metrics import worker_activity
+
+    worker_activity.started()
+
+
+def post_request(worker, req, environ, resp):
+    from config.metrics import worker_activity
+
+    worker_activity.finished()
+
+
+def child_exit(server, worker):
+    # Runs in the master, which must not create metric files of its own.
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
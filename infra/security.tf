@@ -30,6 +30,13 @@ resource "yandex_vpc_security_group" "app_sg" {
     security_group_id = yandex_vpc_security_group.monitoring_sg.id
   }
 
+  ingress {
+    protocol          = "TCP"
+    description       = "App metrics from Monitoring"
+    port              = 9102
+    security_group_id = yandex_vpc_security_group.monitoring_sg.id
+  }
+
   egress {
     protocol       = "ANY"
     v4_cidr_blocks = ["0.0.0.0/0"]
@@ -0,0 +1,93 @@
+import logging
+import runpy
+from http import HTTPStatus
+from pathlib import Path
+from unittest import mock
+
+import pytest
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from django.db import connection
+from django.db import connections
+from psycopg_pool import ConnectionPool
+
+from config.pools import pool_stats
+
+pytestmark = pytest.mark.django_db
+
+GUNICORN_CONF = Path(settings.BASE_DIR) / "gunicorn.conf.py"
+
+
+@pytest.fixture
+def pool():
+    with ConnectionPool(
+        kwargs=connection.get_connection_params(),
+        min_size=1,
+        max_size=1,
+    ) as pool:
+        yield pool
+
+
+def test_pool_stats_count_checkouts(pool):
+    with pool.connection():
+        stats = pool_stats(pool)
+    assert stats["max_size"] == 1
+    assert stats["in_use"] == 1
+    assert stats["waiting"] == 0
+    assert stats["requests"] == 1
+    assert stats["checkout_wait_ms_avg"] >= 0
+
+
+def test_pool_replaces_dead_connections():
+    settings_dict = {
+        **connection.settings_dict,
+        "CONN_MAX_AGE": 0,
+        "CONN_HEALTH_CHECKS": True,
+        "OPTIONS": {"pool": {"min_size": 1, "max_size": 1}},
+    }
+    pooled = connections[DEFAULT_DB_ALIAS].__class__(settings_dict, alias="pool_check")
+    # django.contrib.postgres looks the connection up by alias.
+    connections["pool_check"] = pooled
+    try:
+        pooled.ensure_connection()
+        pid = pooled.connection.info.backend_pid
+        pooled.close()
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_terminate_backend(%s)", [pid])
+
+        with pooled.cursor() as cursor:
+            cursor.execute("SELECT pg_backend_pid()")
+            assert cursor.fetchone()[0] != pid
+    finally:
+        pooled.close()
+        pooled.close_pool()
+        del connections["pool_check"]
+
+
+def test_db_pool_endpoint(client, pool):
+    with mock.patch("config.views.database_pools", return_value={"default": pool}):
+        response = client.get("/health/db-pool")
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()["pools"]["default"]["size"] >= 1
+
+
+def test_db_pool_endpoint_without_pools(client):
+    response = client.get("/health/db-pool")
+
+    assert response.json()["pools"] == {}
+
+
+@pytest.mark.parametrize(("workers", "fits"), [("4", True), ("5", False)])
+def test_gunicorn_connection_budget(monkeypatch, workers, fits):
+    monkeypatch.setenv("WEB_CONCURRENCY", workers)
+    monkeypatch.setenv("DJANGO_DB_POOL_MAX_SIZE", "5")
+    monkeypatch.setenv("DJANGO_DB_CONNECTION_BUDGET", "20")
+    conf = runpy.run_path(str(GUNICORN_CONF))
+    server = mock.Mock(log=logging.getLogger("gunicorn.error"))
+
+    if fits:
+        conf["on_starting"](server)
+    else:
+        with pytest.raises(RuntimeError, match="DJANGO_DB_CONNECTION_BUDGET=20"):
+            conf["on_starting"](server)
@@ -10,3 +10,8 @@ def test_health_endpoint(client):
 
     assert response.status_code == HTTPStatus.OK
     assert response.json() == {"status": "ok"}
+
+
+def test_health_endpoint_skips_request_transaction(client, django_assert_num_queries):
+    with django_assert_num_queries(0):
+        client.get("/health")
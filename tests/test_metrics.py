@@ -0,0 +1,94 @@
+import logging
+import runpy
+from http import HTTPStatus
+from pathlib import Path
+from unittest import mock
+
+import pytest
+from django.conf import settings
+from prometheus_client import REGISTRY
+
+from config import metrics
+from config.middleware import QueryBudgetMiddleware
+
+pytestmark = pytest.mark.django_db
+
+GUNICORN_CONF = Path(settings.BASE_DIR) / "gunicorn.conf.py"
+
+
+def metric(name: str, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+def test_records_requests_by_url_name(client):
+    labels = {"view": "health", "method": "GET"}
+    before = metric("django_http_request_duration_seconds_count", **labels)
+
+    client.get("/health")
+
+    assert metric("django_http_request_duration_seconds_count", **labels) == before + 1
+    assert metric("django_http_responses_total", status="200", **labels) >= 1
+
+
+def test_unmatched_paths_share_one_label(client):
+    labels = {"view": metrics.UNRESOLVED, "method": "other"}
+    before = metric("django_http_responses_total", status="404", **labels)
+
+    client.generic("PROPFIND", "/no-such-page/")
+
+    assert metric("django_http_responses_total", status="404", **labels) == before + 1
+
+
+def test_records_queries_per_request(client, django_user_model):
+    client.force_login(django_user_model.objects.create_user("metrics"))
+    before = metric("django_db_queries_per_request_sum", view="users:redirect")
+
+    response = client.get("/users/~redirect/")
+
+    queries = metric("django_db_queries_per_request_sum", view="users:redirect")
+    report = response[QueryBudgetMiddleware.header]
+    assert report.startswith(f"count={queries - before:.0f};")
+
+
+def test_metrics_endpoint(client):
+    client.get("/health")
+
+    response = client.get("/metrics")
+
+    assert response.status_code == HTTPStatus.OK
+    assert response["Content-Type"].startswith("text/plain")
+    assert b'django_http_responses_total{method="GET",status="200",view="health"}' in (
+        response.content
+    )
+
+
+def test_metrics_aggregate_worker_files(monkeypatch, tmp_path):
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+
+    # No worker has written metrics yet.
+    assert metrics.collect() == b""
+
+
+def test_busy_worker_gauges():
+    activity = metrics.WorkerActivity()
+
+    activity.started()
+    activity.started()
+    assert metric("gunicorn_workers_busy") == 1
+    activity.finished()
+    assert metric("gunicorn_workers_busy") == 1
+    activity.finished()
+    assert metric("gunicorn_workers_busy") == 0
+
+
+def test_gunicorn_clears_metrics_dir(monkeypatch, tmp_path):
+    metrics_dir = tmp_path / "prometheus"
+    metrics_dir.mkdir()
+    (metrics_dir / "counter_1.db").write_bytes(b"stale")
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(metrics_dir))
+    conf = runpy.run_path(str(GUNICORN_CONF))
+
+    conf["on_starting"](mock.Mock(log=logging.getLogger("gunicorn.error")))
+
+    assert metrics_dir.is_dir()
+    assert not any(metrics_dir.iterdir())
@@ -0,0 +1,195 @@
+"""
+Query budgets of every URL in the projects and users apps.
+
+Each view is requested against seeded data with several rows behind every
+relation, so a query per row (an N+1 lookup) pushes it over its budget.
+Counts come from QueryBudgetMiddleware's header and include the session and
+user lookups, and the savepoint pair of views under ATOMIC_REQUESTS.
+"""
+
+import re
+from collections.abc import Callable
+from dataclasses import dataclass
+from types import SimpleNamespace
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+
+from config.middleware import QueryBudgetMiddleware
+from django_educational_demo_application.projects.models import Course
+from django_educational_demo_application.projects.models import Enrollment
+from django_educational_demo_application.projects.models import Project
+from django_educational_demo_application.projects.models import Task
+from django_educational_demo_application.projects.urls import (
+    urlpatterns as project_urls,
+)
+from django_educational_demo_application.users.tests.factories import UserFactory
+from django_educational_demo_application.users.urls import urlpatterns as user_urls
+
+pytestmark = pytest.mark.django_db
+
+ROWS = 3
+XHR = {"X-Requested-With": "XMLHttpRequest"}
+HEADER = re.compile(r"count=(\d+); duplicates=(\d+);")
+
+
+@dataclass(frozen=True)
+class Budget:
+    queries: int
+    method: str = "get"
+    data: Callable[[SimpleNamespace], dict] | None = None
+    duplicates: int = 0
+
+
+BUDGETS = {
+    "projects:dashboard": Budget(7),
+    "projects:course_list": Budget(4),
+    "projects:course_create": Budget(4),
+    "projects:course_detail": Budget(6),
+    "projects:course_update": Budget(5),
+    "projects:course_delete": Budget(5),
+    "projects:course_gradebook": Budget(4),
+    "projects:student_list": Budget(4),
+    "projects:student_detail": Budget(5),
+    "projects:project_list": Budget(6),
+    # The selection spans every course and student.
+    "projects:project_bulk_transition": Budget(
+        9,
+        "post",
+        lambda seed: {
+            "project_ids": ",".join(str(project.pk) for project in seed.projects),
+            "new_status": "review",
+        },
+    ),
+    "projects:project_create": Budget(6),
+    "projects:project_detail": Budget(5),
+    "projects:project_update": Budget(7),
+    "projects:project_delete": Budget(6),
+    "projects:project_transition": Budget(
+        6,
+        "post",
+        lambda seed: {"new_status": "review"},
+    ),
+    "projects:task_create": Budget(
+        8,
+        "post",
+        lambda seed: {"title": "New task", "order": 0},
+    ),
+    "projects:task_bulk_create": Budget(
+        7,
+        "post",
+        lambda seed: {"titles": "First\nSecond\nThird"},
+    ),
+    "projects:task_reorder": Budget(
+        7,
+        "post",
+        lambda seed: {"task_ids": ",".join(str(task.pk) for task in seed.tasks[::-1])},
+    ),
+    "projects:task_update": Budget(3, "post"),
+    "projects:task_delete": Budget(8, "delete"),
+    "projects:task_move": Budget(
+        8,
+        "post",
+        lambda seed: {"after": seed.tasks[-1].pk},
+    ),
+    "users:redirect": Budget(4),
+    "users:update": Budget(4),
+    "users:detail": Budget(5),
+}
+
+URLS = [("projects", pattern) for pattern in project_urls] + [
+    ("users", pattern) for pattern in user_urls
+]
+
+
+@pytest.fixture
+def seed():
+    """Courses with enrolled students, each with a project, tasks and a log."""
+    today = timezone.now().date()
+    courses = [
+        Course.objects.create(
+            name=f"Course {number}",
+            code=f"C{number}",
+            start_date=today - timezone.timedelta(days=7),
+            end_date=today + timezone.timedelta(days=30),
+        )
+        for number in range(ROWS)
+    ]
+    # Explicit usernames: the factory reuses the user of a repeated fake one.
+    students = [
+        UserFactory(username=f"student{number}").student_profile
+        for number in range(ROWS)
+    ]
+    projects = []
+    for course in courses:
+        for student in students:
+            Enrollment.objects.create(student=student, course=course)
+            project = Project.objects.create(
+                title=f"Project {course.code}",
+                course=course,
+                student=student,
+                deadline=today,
+            )
+            Task.objects.bulk_create(
+                Task(project=project, title=f"Task {number}", order=number + 1)
+                for number in range(ROWS)
+            )
+            project.transition_to("in_progress", user=student.user)
+            projects.append(project)
+    project = projects[0]
+    return SimpleNamespace(
+        user=project.student.user,
+        course=project.course,
+        student=project.student,
+        project=project,
+        projects=projects,
+        tasks=list(project.tasks.order_by("order")),
+    )
+
+
+def url_for(namespace, pattern, seed) -> str:
+    objects = {
+        "course": seed.course,
+        "student": seed.student,
+        "project": seed.project,
+        "task": seed.tasks[0],
+    }
+    kwargs = {}
+    for name in pattern.pattern.converters:
+        if name == "username":
+            kwargs[name] = seed.user.username
+        elif name == "project_pk":
+            kwargs[name] = seed.project.pk
+        else:
+            kwargs[name] = objects[pattern.name.split("_")[0]].pk
+    return reverse(f"{namespace}:{pattern.name}", kwargs=kwargs)
+
+
+def test_every_url_has_a_budget():
+    assert {f"{namespace}:{pattern.name}" for namespace, pattern in URLS} == set(
+        BUDGETS,
+    )
+
+
+@pytest.mark.parametrize(
+    ("namespace", "pattern"),
+    URLS,
+    ids=[f"{namespace}:{pattern.name}" for namespace, pattern in URLS],
+)
+def test_query_budget(client, seed, namespace, pattern):
+    budget = BUDGETS[f"{namespace}:{pattern.name}"]
+    client.force_login(seed.user)
+
+    request = getattr(client, budget.method)
+    response = request(
+        url_for(namespace, pattern, seed),
+        budget.data(seed) if budget.data else {},
+        headers=XHR,
+    )
+
+    assert response.status_code < 400  # noqa: PLR2004
+    report = response[QueryBudgetMiddleware.header]
+    queries, duplicates = map(int, HEADER.match(report).groups())
+    assert queries <= budget.queries, report
+    assert duplicates <= budget.duplicates, report